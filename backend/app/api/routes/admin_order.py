@@ -0,0 +1,98 @@
+from fastapi import APIRouter, Query, status
+from fastapi.responses import StreamingResponse
+from typing import Literal, Optional
+from datetime import datetime
+
+from app.models.order import OrdersResponse, OrderFilters, ArchiveOrdersResponse, OrderStatusEnum
+from app.core import config
+from app.services.order_service import OrderService
+from app.services.order_export_service import OrderExportService
+
+router = APIRouter(prefix="/admin/orders")
+
+
+@router.get(
+    "",
+    response_model=OrdersResponse,
+    status_code=status.HTTP_200_OK,
+    summary="List All Orders (Admin)",
+    description="Get filtered and paginated list of orders across all users"
+)
+async def list_all_orders(
+    search: Optional[str] = Query(None, description="Search by order number, name, or email"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    date_from: Optional[str] = Query(None, alias="dateFrom", description="Filter from date (ISO format)"),
+    date_to: Optional[str] = Query(None, alias="dateTo", description="Filter to date (ISO format)"),
+    min_amount: Optional[float] = Query(None, alias="minAmount", ge=0, description="Minimum order amount"),
+    max_amount: Optional[float] = Query(None, alias="maxAmount", ge=0, description="Maximum order amount"),
+    page: int = Query(1, ge=1, description="Page number"),
+    limit: int = Query(10, ge=1, le=100, description="Items per page")
+):
+    """List orders for all users (admin)"""
+    filters = OrderFilters(
+        search=search,
+        status=status,
+        date_from=date_from,
+        date_to=date_to,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        page=page,
+        limit=limit
+    )
+    
+    return await OrderService.list_all_orders(filters)
+
+
+@router.post(
+    "/archive",
+    response_model=ArchiveOrdersResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Archive Old Orders (Admin)",
+    description="Move delivered and cancelled orders to compressed cold storage"
+)
+async def archive_orders(
+    older_than_days: int = Query(
+        config.ORDER_ARCHIVE_AFTER_DAYS,
+        alias="olderThanDays",
+        ge=0,
+        description="Only archive orders not updated for this many days"
+    )
+):
+    """
+    Archive terminal orders.
+    
+    Archived orders remain available through order details, listing and
+    search; they are loaded from the archive on demand.
+    """
+    return ArchiveOrdersResponse(archived=OrderService.archive_orders(older_than_days))
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    summary="Export Orders (Admin)",
+    description="Stream orders as CSV, NDJSON or Parquet for finance reconciliation",
+    response_class=StreamingResponse
+)
+async def export_orders(
+    export_format: Literal["csv", "ndjson", "parquet"] = Query("csv", alias="format", description="Export format"),
+    status: Optional[OrderStatusEnum] = Query(None, description="Filter by status"),
+    date_from: Optional[str] = Query(None, alias="dateFrom", description="Filter from date (ISO format)"),
+    date_to: Optional[str] = Query(None, alias="dateTo", description="Filter to date (ISO format)")
+):
+    """
+    Stream an order export.
+    
+    - csv / parquet: one row per order item with order totals repeated
+    - ndjson: one complete order per line
+    
+    Orders are read in chunks in order-date order, so memory use does not
+    grow with the size of the export.
+    """
+    stream = OrderExportService.get_stream(export_format, date_from, date_to, status)
+    filename = f"orders-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.{export_format}"
+    return StreamingResponse(
+        stream,
+        media_type=OrderExportService.MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
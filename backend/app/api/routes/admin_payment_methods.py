@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Query, status
+from typing import List, Optional
+
+from app.models.order import AdminPaymentMethodsResponse
+from app.services.checkout_service import CheckoutService
+
+router = APIRouter(prefix="/admin/payment-methods")
+
+
+@router.get(
+    "",
+    response_model=AdminPaymentMethodsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="List Payment Methods (Admin)",
+    description="List saved payment methods for many users in one call"
+)
+async def list_payment_methods(
+    user_ids: Optional[List[str]] = Query(None, alias="userId", description="Users to include (repeatable); all users if omitted"),
+    page: int = Query(1, ge=1, description="Page number over users"),
+    limit: int = Query(50, ge=1, le=500, description="Users per page")
+):
+    """
+    List saved payment methods grouped by user.
+    
+    Each entry includes the user's default payment method id. Unknown user
+    ids are skipped.
+    """
+    return await CheckoutService.list_payment_methods_admin(user_ids, page, limit)
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Path, Query, Body, status, Depends
-from typing import Optional
+from fastapi import APIRouter, Path, Query, Body, status, Depends, Header, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional
+from datetime import date
 
 from app.models.appointment import (
     Appointment, BookAppointmentInput, RescheduleAppointmentInput,
-    AppointmentsResponse, AppointmentStatus
+    AppointmentsResponse, AppointmentStatus, AvailabilityResponse,
+    ClinicResource, ResourceType, AppointmentSeries, BookAppointmentSeriesInput
 )
 from app.services.appointment_service import AppointmentService
+from app.services.clinic_resource_service import ClinicResourceService
+from app.services.appointment_calendar_service import AppointmentCalendarService
 
 router = APIRouter(prefix="/appointments")
 
@@ -33,6 +38,66 @@ async def get_my_appointments(
     return await AppointmentService.get_user_appointments(user_id, page, limit, status_enum, pet_id)
 
 
+@router.get(
+    "/my-appointments.ics",
+    status_code=status.HTTP_200_OK,
+    summary="My Appointments Calendar Feed",
+    description="Stream the user's appointments as an iCalendar feed; supports If-Modified-Since",
+    response_class=StreamingResponse
+)
+async def get_my_calendar_feed(
+    if_modified_since: Optional[str] = Header(None),
+    user_id: str = Depends(get_current_user_id)
+):
+    """Stream the user's appointments as .ics"""
+    last_modified = AppointmentService.get_last_modified(user_id)
+    headers = {"Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = AppointmentCalendarService.format_http_date(last_modified)
+    if AppointmentCalendarService.is_not_modified(last_modified, if_modified_since):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    headers["Content-Disposition"] = 'attachment; filename="my-appointments.ics"'
+    return StreamingResponse(
+        AppointmentCalendarService.stream_feed("My Pet Appointments", owner_id=user_id),
+        media_type=AppointmentCalendarService.MEDIA_TYPE,
+        headers=headers
+    )
+
+
+@router.get(
+    "/availability",
+    response_model=AvailabilityResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get Available Slots",
+    description="Get the first free appointment slots within clinic hours for a day or week"
+)
+async def get_availability(
+    day: date = Query(..., alias="date", description="First day to search (yyyy-MM-dd)"),
+    duration: int = Query(30, ge=15, le=480, description="Appointment length in minutes"),
+    view: Literal["day", "week"] = Query("day", description="Search one day or seven days"),
+    limit: int = Query(20, ge=1, le=200, description="Maximum number of slots"),
+    vet_id: Optional[str] = Query(None, alias="vetId", description="Only slots with this veterinarian")
+):
+    """Get free appointment slots"""
+    days = 7 if view == "week" else 1
+    return await AppointmentService.get_availability(day, duration, days, limit, vet_id)
+
+
+@router.get(
+    "/resources",
+    response_model=List[ClinicResource],
+    status_code=status.HTTP_200_OK,
+    summary="Get Clinic Resources",
+    description="Get the veterinarians and rooms appointments can be booked with"
+)
+async def get_resources(
+    resource_type: Optional[ResourceType] = Query(None, alias="type")
+):
+    """Get bookable vets and rooms"""
+    return await ClinicResourceService.get_resources(resource_type)
+
+
 @router.post(
     "",
     response_model=Appointment,
@@ -48,12 +113,57 @@ async def book_appointment(
     return await AppointmentService.book_appointment(appointment_input, user_id)
 
 
+@router.post(
+    "/series",
+    response_model=AppointmentSeries,
+    status_code=status.HTTP_201_CREATED,
+    summary="Book Recurring Appointments",
+    description="Book a weekly or monthly appointment series (bounded by count or until)"
+)
+async def book_appointment_series(
+    series_input: BookAppointmentSeriesInput = Body(...),
+    user_id: str = Depends(get_current_user_id)
+):
+    """Book a recurring appointment series"""
+    return await AppointmentService.book_appointment_series(series_input, user_id)
+
+
+@router.get(
+    "/series/{series_id}",
+    response_model=AppointmentSeries,
+    status_code=status.HTTP_200_OK,
+    summary="Get Recurring Appointments",
+    description="Get an appointment series with its rule and cancelled occurrences"
+)
+async def get_appointment_series(
+    series_id: str = Path(...),
+    user_id: str = Depends(get_current_user_id)
+):
+    """Get an appointment series"""
+    return await AppointmentService.get_series(series_id, user_id)
+
+
+@router.patch(
+    "/series/{series_id}/cancel",
+    response_model=AppointmentSeries,
+    status_code=status.HTTP_200_OK,
+    summary="Cancel Recurring Appointments",
+    description="Cancel every remaining occurrence of an appointment series"
+)
+async def cancel_appointment_series(
+    series_id: str = Path(...),
+    user_id: str = Depends(get_current_user_id)
+):
+    """Cancel an appointment series"""
+    return await AppointmentService.cancel_appointment_series(series_id, user_id)
+
+
 @router.patch(
     "/{appointment_id}/cancel",
     response_model=Appointment,
     status_code=status.HTTP_200_OK,
     summary="Cancel Appointment",
-    description="Cancel a scheduled appointment"
+    description="Cancel a scheduled appointment or a single occurrence of a series"
 )
 async def cancel_appointment(
     appointment_id: str = Path(...),
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Body, Query, status, Depends
-from typing import List
+from typing import List, Optional
 
 from app.models.order import (
     ShippingAddressInput,
@@ -8,9 +8,14 @@ from app.models.order import (
     ShippingValidationResponse,
     ShippingCalculationResponse,
     CheckoutDataInput,
-    OrderDetails
+    OrderDetails,
+    BatchCardValidationRequest,
+    BatchCardValidationResponse,
+    CheckoutSession,
+    CreateCheckoutSessionRequest
 )
 from app.services.checkout_service import CheckoutService
+from app.services.checkout_session_service import CheckoutSessionService
 from app.services.order_service import OrderService
 
 router = APIRouter(prefix="")
@@ -79,7 +84,9 @@ async def validate_shipping(
 )
 async def calculate_shipping(
     address: ShippingAddressInput = Body(...),
-    subtotal: float = Query(0.0, ge=0, description="Cart subtotal for free shipping calculation")
+    subtotal: Optional[float] = Query(None, ge=0, description="Cart subtotal for free shipping calculation (default: the user's cart)"),
+    item_count: Optional[int] = Query(None, ge=1, alias="itemCount", description="Number of units, for weight-based rates (default: the user's cart)"),
+    user_id: str = Depends(get_current_user_id)
 ):
     """
     Calculate shipping costs for all available shipping methods.
@@ -89,11 +96,14 @@ async def calculate_shipping(
     - Express shipping (2-day)
     - Overnight shipping (1-day)
     
-    Also includes estimated delivery days for each method.
+    Costs depend on the destination zone (from the ZIP code) and the
+    estimated parcel weight (from the item count). Also includes estimated
+    delivery days for each method.
     
     Args:
         address: Shipping address
-        subtotal: Cart subtotal (optional, for free shipping calculation)
+        subtotal: Cart subtotal (optional, taken from the user's cart if omitted)
+        item_count: Units in the cart (optional, taken from the user's cart if omitted)
         
     Returns:
         ShippingCalculationResponse with costs and estimated days
@@ -101,7 +111,7 @@ async def calculate_shipping(
     Raises:
         400: Invalid shipping address
     """
-    return await CheckoutService.calculate_shipping(address, subtotal)
+    return await CheckoutService.calculate_shipping(address, subtotal, item_count, user_id)
 
 
 @router.get(
@@ -129,6 +139,31 @@ async def get_payment_methods(
     return await CheckoutService.get_payment_methods(user_id)
 
 
+@router.post(
+    "/payment-methods:validate",
+    response_model=BatchCardValidationResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Validate Card Numbers (Bulk)",
+    description="Luhn-check and classify up to 10,000 card numbers at once"
+)
+async def validate_card_numbers(
+    request: BatchCardValidationRequest = Body(...)
+):
+    """
+    Validate card numbers in bulk, e.g. when importing cards on file.
+    
+    Each result reports Luhn validity, detected brand and last 4 digits, in
+    input order. Full card numbers are never echoed back.
+    
+    Args:
+        request: Card numbers to validate
+        
+    Returns:
+        BatchCardValidationResponse with per-number results and counts
+    """
+    return await CheckoutService.validate_card_numbers(request.card_numbers)
+
+
 @router.post(
     "/payment-methods",
     response_model=PaymentMethodResponse,
@@ -184,6 +219,51 @@ async def add_payment_method(
     return await CheckoutService.add_payment_method(payment_method, user_id)
 
 
+@router.post(
+    "/checkout/sessions",
+    response_model=CheckoutSession,
+    status_code=status.HTTP_201_CREATED,
+    summary="Start Checkout Session",
+    description="Validate the address and quote shipping once for the rest of checkout"
+)
+async def create_checkout_session(
+    request: CreateCheckoutSessionRequest = Body(...),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    Start a checkout session.
+    
+    Validates the shipping address, refreshes the cart and quotes shipping,
+    and returns the resulting order summary. Pass the session id as
+    `sessionId` when creating the order so those steps are not repeated
+    unless the address or cart changed in the meantime.
+    
+    Raises:
+        400: Invalid address or empty cart
+    """
+    return await CheckoutSessionService.create_session(request, user_id)
+
+
+@router.get(
+    "/checkout/sessions/{session_id}",
+    response_model=CheckoutSession,
+    status_code=status.HTTP_200_OK,
+    summary="Get Checkout Session",
+    description="Get a live checkout session (extends its expiry)"
+)
+async def get_checkout_session(
+    session_id: str,
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    Get a checkout session.
+    
+    Raises:
+        404: Session not found or expired
+    """
+    return CheckoutSessionService.get_session_or_404(session_id, user_id)
+
+
 @router.post(
     "/orders",
     response_model=OrderDetails,
@@ -223,7 +303,7 @@ async def create_order_checkout(
     Create an order from checkout data.
     
     This endpoint:
-    1. Validates the shipping address
+    1. Validates the shipping address (skipped if unchanged since the checkout session)
     2. Verifies order summary matches server calculations
     3. Creates order from user's cart
     4. Processes payment (mock)
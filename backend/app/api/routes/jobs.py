@@ -0,0 +1,25 @@
+from fastapi import APIRouter, status
+
+from app.models.job import JobQueueMetrics
+from app.services.job_service import JobService
+
+router = APIRouter(prefix="/admin/jobs")
+
+
+@router.get(
+    "/metrics",
+    response_model=JobQueueMetrics,
+    status_code=status.HTTP_200_OK,
+    summary="Job Queue Metrics (Admin)",
+    description="Get background job queue depth, lag and throughput counters"
+)
+async def get_job_metrics():
+    """
+    Get background job queue metrics.
+    
+    - **depth**: jobs ready to run
+    - **delayed**: jobs waiting out a retry backoff
+    - **oldestLagSeconds**: how long the oldest ready job has been waiting
+    - **averageLagSeconds**: mean wait between a job becoming ready and starting
+    """
+    return await JobService.get_metrics()
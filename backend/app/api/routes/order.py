@@ -7,9 +7,14 @@ from app.models.order import (
     ReturnRequest,
     OrderActionResponse,
     UpdateOrderStatusRequest,
-    ShipOrderRequest
+    ShipOrderRequest,
+    OrderAnalyticsResponse,
+    BatchShipRequest,
+    BatchStatusRequest,
+    BatchOrderResponse
 )
 from app.services.order_service import OrderService
+from app.services.order_analytics_service import OrderAnalyticsService
 
 router = APIRouter(prefix="/orders")
 
@@ -77,8 +82,8 @@ async def checkout(
     "",
     response_model=OrdersResponse,
     status_code=status.HTTP_200_OK,
-    summary="List Orders",
-    description="Get filtered and paginated list of orders"
+    summary="List My Orders",
+    description="Get filtered and paginated list of the current user's orders"
 )
 async def list_orders(
     search: Optional[str] = Query(None, description="Search by order number, name, or email"),
@@ -91,7 +96,7 @@ async def list_orders(
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
     user_id: str = Depends(get_current_user_id)
 ):
-    """List orders with filtering"""
+    """List the current user's orders with filtering"""
     from app.models.order import OrderFilters
     
     filters = OrderFilters(
@@ -107,6 +112,26 @@ async def list_orders(
     
     return await OrderService.list_orders(filters, user_id)
 
+@router.get(
+    "/analytics",
+    response_model=OrderAnalyticsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Order Analytics",
+    description="Get daily revenue, order counts by status and top products"
+)
+async def get_order_analytics(
+    date_from: Optional[str] = Query(None, alias="dateFrom", description="First day for daily revenue (yyyy-MM-dd)"),
+    date_to: Optional[str] = Query(None, alias="dateTo", description="Last day for daily revenue (yyyy-MM-dd)"),
+    top: int = Query(10, ge=1, le=100, description="Number of top products by revenue")
+):
+    """
+    Get sales analytics.
+    
+    Served from incrementally maintained rollups, so the cost depends on the
+    number of days and products rather than the number of orders.
+    """
+    return await OrderAnalyticsService.get_analytics(date_from, date_to, top)
+
 @router.get(
     "/{order_id}",
     response_model=OrderDetails,
@@ -314,4 +339,43 @@ async def ship_order(
         "tracking_url": request.tracking_url,
         "estimated_delivery": request.estimated_delivery
     }
-    return await OrderService.ship_order(order_id, shipping_data)
\ No newline at end of file
+    return await OrderService.ship_order(order_id, shipping_data)
+
+
+@router.post(
+    ":batchShip",
+    response_model=BatchOrderResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Batch Ship Orders",
+    description="Mark many orders as shipped with tracking information in one request"
+)
+async def batch_ship_orders(
+    request: BatchShipRequest = Body(...)
+):
+    """
+    Ship a batch of orders.
+    
+    Each order must be 'confirmed' or 'processing'. Invalid items are reported
+    in the per-item results and do not block the rest of the batch.
+    """
+    return await OrderService.batch_ship_orders(request.items)
+
+
+@router.post(
+    ":batchStatus",
+    response_model=BatchOrderResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Batch Update Order Status",
+    description="Change the status of many orders in one request"
+)
+async def batch_update_order_status(
+    request: BatchStatusRequest = Body(...)
+):
+    """
+    Update the status of a batch of orders.
+    
+    Transitions are validated per order (e.g. 'shipped' can only move to
+    'delivered'). Invalid items are reported in the per-item results and do
+    not block the rest of the batch.
+    """
+    return await OrderService.batch_update_status(request.items)
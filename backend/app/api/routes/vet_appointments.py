@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Path, Query, Body, status, HTTPException
+from fastapi import APIRouter, Path, Query, Body, status, HTTPException, Header, Response
+from fastapi.responses import StreamingResponse
 from typing import Optional
+from datetime import date
 
 from app.models.appointment import (
-    Appointment, AppointmentsResponse, UpdateAppointmentStatusInput
+    Appointment, AppointmentsResponse, UpdateAppointmentStatusInput,
+    BulkBookAppointmentsRequest, BulkBookAppointmentsResponse
 )
 from app.services.appointment_service import AppointmentService
+from app.services.appointment_calendar_service import AppointmentCalendarService
 
 router = APIRouter(prefix="/vet/appointments")
 
@@ -35,6 +39,61 @@ async def get_vet_appointments(
         page, limit, search, date, start_date, end_date
     )
 
+@router.get(
+    ".ics",
+    status_code=status.HTTP_200_OK,
+    summary="Appointments Calendar Feed (Vet)",
+    description="Stream all appointments as an iCalendar feed; supports If-Modified-Since",
+    response_class=StreamingResponse
+)
+async def get_vet_calendar_feed(
+    start_date: Optional[date] = Query(None, alias="startDate", description="Earliest day to include (yyyy-MM-dd)"),
+    end_date: Optional[date] = Query(None, alias="endDate", description="Latest day to include (yyyy-MM-dd)"),
+    if_modified_since: Optional[str] = Header(None)
+):
+    """
+    Stream the clinic calendar as .ics.
+    
+    Responds 304 Not Modified when nothing changed since If-Modified-Since,
+    so polling calendar clients don't re-download the feed.
+    """
+    last_modified = AppointmentService.get_last_modified()
+    headers = {"Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = AppointmentCalendarService.format_http_date(last_modified)
+    if AppointmentCalendarService.is_not_modified(last_modified, if_modified_since):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    headers["Content-Disposition"] = 'attachment; filename="appointments.ics"'
+    return StreamingResponse(
+        AppointmentCalendarService.stream_feed("Clinic Appointments", start_date, end_date),
+        media_type=AppointmentCalendarService.MEDIA_TYPE,
+        headers=headers
+    )
+
+
+@router.post(
+    ":bulk",
+    response_model=BulkBookAppointmentsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Bulk Book Appointments (Vet)",
+    description="Book many appointments in one request, e.g. for a vaccination drive"
+)
+async def bulk_book_appointments(
+    request: BulkBookAppointmentsRequest = Body(...)
+):
+    """
+    Book a batch of appointments.
+    
+    Requests are resolved in start-time order, so when two requests in the
+    batch compete for the last free vet or room the earlier one wins.
+    Conflicting or invalid requests are reported in the per-item results
+    (with the status code a single booking would have returned) and do not
+    block the rest of the batch.
+    """
+    return await AppointmentService.bulk_book_appointments(request.appointments)
+
+
 @router.get(
     "/{appointment_id}",
     response_model=Appointment,
@@ -0,0 +1,124 @@
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+# Characters allowed as separators in card numbers
+_SEPARATORS = str.maketrans("", "", " -\t\n\r\f\v")
+
+# Luhn value of a doubled digit (d * 2, digits summed)
+LUHN_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+_LUHN_DOUBLED_ARRAY = np.array(LUHN_DOUBLED, dtype=np.int64)
+
+CARD_BRANDS = ("Unknown", "Visa", "Mastercard", "American Express", "Discover")
+
+# Brand rules as (prefix, brand index); longer prefixes win over shorter ones
+_BRAND_PREFIXES = (
+    ("4", 1),
+    ("51", 2), ("52", 2), ("53", 2), ("54", 2), ("55", 2),
+    ("34", 3), ("37", 3),
+    ("6011", 4), ("65", 4)
+)
+PREFIX_DIGITS = 4
+
+
+def _build_prefix_table() -> np.ndarray:
+    """Brand index for every 4-digit prefix 0000-9999"""
+    table = np.zeros(10 ** PREFIX_DIGITS, dtype=np.uint8)
+    for prefix, brand in sorted(_BRAND_PREFIXES, key=lambda rule: len(rule[0])):
+        width = 10 ** (PREFIX_DIGITS - len(prefix))
+        start = int(prefix) * width
+        table[start:start + width] = brand
+    return table
+
+
+BRAND_PREFIX_TABLE = _build_prefix_table()
+
+
+def normalize_card_number(card_number: str) -> str:
+    """Strip spaces and dashes"""
+    return card_number.translate(_SEPARATORS)
+
+
+def _is_digits(value: str) -> bool:
+    return value.isascii() and value.isdigit()
+
+
+def _prefix_key(digits: str) -> int:
+    """
+    Index into BRAND_PREFIX_TABLE for a digit string
+    
+    Short numbers are right-padded with zeros; no brand rule has a zero after
+    its first digit, so padding never creates a match.
+    """
+    return int(digits[:PREFIX_DIGITS].ljust(PREFIX_DIGITS, "0"))
+
+
+def is_valid_card_number(card_number: str) -> bool:
+    """Luhn check of a single card number (spaces and dashes allowed)"""
+    digits = normalize_card_number(card_number)
+    if not _is_digits(digits):
+        return False
+    values = digits.encode("ascii")
+    checksum = sum(values[-1::-2]) - 48 * len(values[-1::-2])
+    checksum += sum(LUHN_DOUBLED[value - 48] for value in values[-2::-2])
+    return checksum % 10 == 0
+
+
+def detect_card_brand(card_number: str) -> str:
+    """Card brand from the number's prefix"""
+    digits = normalize_card_number(card_number)
+    leading = len(digits[:PREFIX_DIGITS]) - len(digits[:PREFIX_DIGITS].lstrip("0123456789"))
+    if leading == 0:
+        return CARD_BRANDS[0]
+    return CARD_BRANDS[BRAND_PREFIX_TABLE[_prefix_key(digits[:leading])]]
+
+
+def validate_card_numbers(card_numbers: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Luhn-check and classify many card numbers at once
+    
+    Numbers are packed right-aligned into one zero-padded digit matrix, so the
+    Luhn doubling positions line up in fixed columns and the checksum for every
+    row is a couple of vectorized sums. Leading zero padding adds nothing to
+    the checksum. Brands come from BRAND_PREFIX_TABLE in one gather.
+    
+    Args:
+        card_numbers: Card numbers (spaces and dashes allowed)
+    
+    Returns:
+        Tuple of (boolean array of Luhn validity, brand name per number)
+    """
+    count = len(card_numbers)
+    if count == 0:
+        return np.zeros(0, dtype=bool), []
+    
+    normalized = [normalize_card_number(number) for number in card_numbers]
+    # Non-ASCII input can't be packed into the byte matrix; blank it (invalid)
+    normalized = [number if number.isascii() else "" for number in normalized]
+    lengths = np.fromiter((len(number) for number in normalized), dtype=np.int64, count=count)
+    width = max(int(lengths.max()), PREFIX_DIGITS)
+    
+    packed = "".join(number.rjust(width, "0") for number in normalized).encode("ascii")
+    matrix = np.frombuffer(packed, dtype=np.uint8).reshape(count, width).astype(np.int64) - 48
+    non_digit = ((matrix < 0) | (matrix > 9)).any(axis=1)
+    matrix = np.where((matrix < 0) | (matrix > 9), 0, matrix)
+    
+    # Columns counted from the right: even offsets as-is, odd offsets doubled
+    offsets = np.arange(width - 1, -1, -1)
+    checksum = matrix[:, offsets % 2 == 0].sum(axis=1)
+    checksum += _LUHN_DOUBLED_ARRAY[matrix[:, offsets % 2 == 1]].sum(axis=1)
+    valid = (checksum % 10 == 0) & ~non_digit & (lengths > 0)
+    
+    # Brand from the left-aligned first PREFIX_DIGITS characters
+    prefixes = "".join(
+        number[:PREFIX_DIGITS].ljust(PREFIX_DIGITS, "0") for number in normalized
+    ).encode("ascii")
+    prefix_digits = np.frombuffer(prefixes, dtype=np.uint8).reshape(count, PREFIX_DIGITS).astype(np.int64) - 48
+    # Only the leading run of digits counts, as in detect_card_brand
+    leading = np.cumprod((prefix_digits >= 0) & (prefix_digits <= 9), axis=1)
+    keys = (prefix_digits * leading) @ (10 ** np.arange(PREFIX_DIGITS - 1, -1, -1))
+    brand_index = BRAND_PREFIX_TABLE[keys]
+    brands = [CARD_BRANDS[index] for index in brand_index.tolist()]
+    
+    return valid, brands
@@ -0,0 +1,45 @@
+import os
+from pathlib import Path
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off")
+
+
+# Local durable state (event logs, snapshots, archives)
+DATA_DIR = Path(os.getenv("PETCARE_DATA_DIR", "data"))
+PERSISTENCE_ENABLED = _env_bool("PETCARE_PERSISTENCE", True)
+
+# Order event log
+ORDER_LOG_FSYNC_BATCH = int(os.getenv("ORDER_LOG_FSYNC_BATCH", "32"))
+ORDER_LOG_FSYNC_INTERVAL = float(os.getenv("ORDER_LOG_FSYNC_INTERVAL", "0.05"))  # seconds; bounds how long an appended event waits for fsync
+ORDER_SNAPSHOT_EVERY = int(os.getenv("ORDER_SNAPSHOT_EVERY", "1000"))  # events
+
+# Order numbers are leased from a shared SQLite sequence in blocks of this size
+ORDER_NUMBER_BLOCK_SIZE = int(os.getenv("ORDER_NUMBER_BLOCK_SIZE", "20"))
+
+# Delivered/cancelled orders untouched for this many days move to the archive
+ORDER_ARCHIVE_AFTER_DAYS = int(os.getenv("ORDER_ARCHIVE_AFTER_DAYS", "90"))
+
+# Background jobs (post-checkout side effects)
+JOB_CONCURRENCY = int(os.getenv("JOB_CONCURRENCY", "4"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_RETRY_BASE_DELAY = float(os.getenv("JOB_RETRY_BASE_DELAY", "0.5"))  # seconds, doubled per attempt
+JOB_RETRY_MAX_DELAY = float(os.getenv("JOB_RETRY_MAX_DELAY", "60"))  # seconds
+JOB_CLAIM_LEASE = float(os.getenv("JOB_CLAIM_LEASE", "300"))  # seconds before a job claimed by a crashed (or other) process is retried
+
+# Checkout sessions (memoized address validation, shipping quote and cart version)
+CHECKOUT_SESSION_TTL = float(os.getenv("CHECKOUT_SESSION_TTL", "900"))  # seconds, refreshed on use
+CHECKOUT_SESSION_MAX = int(os.getenv("CHECKOUT_SESSION_MAX", "10000"))
+
+# Clinic opening hours (UTC) used for appointment availability
+CLINIC_OPEN_HOUR = int(os.getenv("CLINIC_OPEN_HOUR", "8"))
+CLINIC_CLOSE_HOUR = int(os.getenv("CLINIC_CLOSE_HOUR", "18"))
+CLINIC_OPEN_WEEKDAYS = tuple(int(day) for day in os.getenv("CLINIC_OPEN_WEEKDAYS", "0,1,2,3,4,5").split(","))  # Monday = 0
+APPOINTMENT_SLOT_MINUTES = int(os.getenv("APPOINTMENT_SLOT_MINUTES", "15"))  # granularity of offered start times
+
+# Upper bound on occurrences in a recurring appointment series
+APPOINTMENT_SERIES_MAX_OCCURRENCES = int(os.getenv("APPOINTMENT_SERIES_MAX_OCCURRENCES", "104"))
@@ -0,0 +1,245 @@
+import json
+import os
+import threading
+from pathlib import Path
+from time import monotonic
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class EventLog:
+    """
+    Append-only NDJSON event log with compacted snapshots
+    
+    Each event is one JSON line carrying a monotonically increasing sequence
+    number. Writes are flushed to the OS on every append, so a crash of the
+    process alone loses nothing. They are fsynced in batches: on append once
+    `fsync_batch_size` events are pending or `fsync_interval` seconds have
+    passed since the last fsync, and otherwise by a background flusher
+    thread, so a quiet log is still synced. Every event is therefore on disk
+    within `fsync_interval` seconds of being appended (plus the fsync
+    itself), which bounds what an OS crash or power loss can lose.
+    
+    A snapshot stores the full compacted state together with the sequence
+    number it covers; the log is then truncated. Recovery loads the snapshot
+    and replays only the events written after it.
+    
+    A log has a single writer. Sequence numbers, snapshots and truncation all
+    assume the process holds the whole state, so load() takes an exclusive
+    lock on the log for the life of the process and fails if another process
+    (e.g. a second uvicorn worker) already has it.
+    """
+    
+    def __init__(
+        self,
+        directory: Path,
+        name: str,
+        fsync_batch_size: int = 32,
+        fsync_interval: float = 0.05,
+        snapshot_every: int = 1000
+    ):
+        self.directory = Path(directory)
+        self.log_path = self.directory / f"{name}.log.ndjson"
+        self.snapshot_path = self.directory / f"{name}.snapshot.json"
+        self.lock_path = self.directory / f"{name}.lock"
+        self.fsync_batch_size = fsync_batch_size
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        
+        self._file = None
+        self._lock_file = None
+        self._seq = 0
+        self._unsynced = 0
+        self._last_sync = monotonic()
+        self._since_snapshot = 0
+        
+        # Guards the file and counters against the flusher thread
+        self._mutex = threading.Condition()
+        self._flusher: Optional[threading.Thread] = None
+        self._closing = False
+    
+    def _acquire_lock(self) -> None:
+        """
+        Take the single-writer lock, held until close()
+        
+        Raises:
+            RuntimeError: If another process holds the lock
+        """
+        lock_file = open(self.lock_path, "a+", encoding="utf-8")
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock_file.seek(0)
+            owner = lock_file.read().strip() or "unknown"
+            lock_file.close()
+            raise RuntimeError(
+                f"Event log '{self.log_path}' is already open in another process (pid {owner}); "
+                "persistence supports a single worker process"
+            )
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._lock_file = lock_file
+    
+    def load(self) -> Tuple[Optional[Any], List[Dict[str, Any]]]:
+        """
+        Lock the log, then load the latest snapshot and the events written after it
+        
+        A torn trailing line (crash mid-write) is truncated away.
+        
+        Returns:
+            Tuple of (snapshot state or None, tail events in order)
+        
+        Raises:
+            RuntimeError: If another process already has the log open
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._acquire_lock()
+        
+        state = None
+        snapshot_seq = 0
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            state = snapshot["state"]
+            snapshot_seq = snapshot["seq"]
+        
+        events: List[Dict[str, Any]] = []
+        valid_bytes = 0
+        if self.log_path.exists():
+            with open(self.log_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        break
+                    valid_bytes += len(line)
+                    if event["seq"] > snapshot_seq:
+                        events.append(event)
+            if valid_bytes < self.log_path.stat().st_size:
+                with open(self.log_path, "r+b") as f:
+                    f.truncate(valid_bytes)
+        
+        self._seq = events[-1]["seq"] if events else snapshot_seq
+        self._since_snapshot = len(events)
+        self._file = open(self.log_path, "a", encoding="utf-8")
+        
+        self._closing = False
+        self._flusher = threading.Thread(target=self._flush_loop, name=f"{self.log_path.name}-fsync", daemon=True)
+        self._flusher.start()
+        return state, events
+    
+    def _flush_loop(self) -> None:
+        """Fsync pending writes fsync_interval after the last fsync, even if no append follows"""
+        with self._mutex:
+            while not self._closing:
+                if not self._unsynced:
+                    self._mutex.wait()
+                    continue
+                remaining = self._last_sync + self.fsync_interval - monotonic()
+                if remaining > 0:
+                    self._mutex.wait(remaining)
+                    continue
+                self._sync()
+    
+    def _write(self, event_type: str, data: Dict[str, Any]) -> None:
+        self._seq += 1
+        record = {
+            "seq": self._seq,
+            "type": event_type,
+            "ts": datetime.utcnow().isoformat(),
+            "data": data
+        }
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._unsynced += 1
+        self._since_snapshot += 1
+    
+    def _maybe_sync(self) -> None:
+        if (self._unsynced >= self.fsync_batch_size or
+                monotonic() - self._last_sync >= self.fsync_interval):
+            self._sync()
+        else:
+            self._file.flush()
+            self._mutex.notify()  # the flusher syncs the rest in time
+    
+    def append(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Append a single event"""
+        with self._mutex:
+            self._write(event_type, data)
+            self._maybe_sync()
+    
+    def append_many(self, events: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Append several events with a single flush/fsync decision"""
+        with self._mutex:
+            for event_type, data in events:
+                self._write(event_type, data)
+            self._maybe_sync()
+    
+    def _sync(self) -> None:
+        if self._file is None:
+            return
+        self._file.flush()
+        if self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = monotonic()
+    
+    def sync(self) -> None:
+        """Flush and fsync pending writes"""
+        with self._mutex:
+            self._sync()
+    
+    def should_snapshot(self) -> bool:
+        """Whether enough events have accumulated to compact"""
+        return self._since_snapshot >= self.snapshot_every
+    
+    def write_snapshot(self, state: Any) -> None:
+        """
+        Atomically write a snapshot of the current state and truncate the log
+        
+        The state must reflect every event appended so far.
+        """
+        with self._mutex:
+            self._sync()
+            
+            tmp_path = self.snapshot_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"seq": self._seq, "state": state}, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            
+            # Events up to self._seq are now covered by the snapshot
+            self._file.close()
+            self._file = open(self.log_path, "w", encoding="utf-8")
+            self._since_snapshot = 0
+    
+    def close(self) -> None:
+        """Stop the flusher, sync and close the log, releasing the writer lock"""
+        with self._mutex:
+            self._closing = True
+            self._mutex.notify()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        with self._mutex:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+        if self._lock_file is not None:
+            self._lock_file.close()  # closing the handle releases the lock
+            self._lock_file = None
@@ -0,0 +1,136 @@
+from bisect import bisect_left, insort
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+Interval = Tuple[datetime, datetime, str]  # (start, end, item_id)
+
+
+class IntervalIndex:
+    """
+    Index of half-open [start, end) intervals for fast overlap queries
+    
+    Intervals are bucketed by the calendar day they start on, and each bucket
+    is kept sorted by start. Any interval overlapping [start, end) must start
+    before `end` and no earlier than `start - max_span` (the longest interval
+    indexed so far), so a query only bisects into the buckets for those few
+    days and walks the k candidates in between: O(log n + k) regardless of
+    how many intervals are indexed on other days.
+    """
+    
+    def __init__(self):
+        self._buckets: Dict[date, List[Interval]] = {}
+        self._intervals: Dict[str, Tuple[datetime, datetime]] = {}
+        self._max_span = timedelta(0)
+    
+    def add(self, item_id: str, start: datetime, end: datetime) -> None:
+        """Index (or move) an item's interval"""
+        if item_id in self._intervals:
+            self.remove(item_id)
+        insort(self._buckets.setdefault(start.date(), []), (start, end, item_id))
+        self._intervals[item_id] = (start, end)
+        self._max_span = max(self._max_span, end - start)
+    
+    def remove(self, item_id: str) -> None:
+        """Drop an item from the index (no-op if absent)"""
+        interval = self._intervals.pop(item_id, None)
+        if interval is None:
+            return
+        start, end = interval
+        day = start.date()
+        bucket = self._buckets[day]
+        del bucket[bisect_left(bucket, (start, end, item_id))]
+        if not bucket:
+            del self._buckets[day]
+    
+    def overlapping(
+        self,
+        start: datetime,
+        end: datetime,
+        exclude: Optional[str] = None
+    ) -> Iterator[Interval]:
+        """
+        Yield indexed intervals overlapping [start, end), ordered by start
+        
+        Args:
+            start: Query start
+            end: Query end (exclusive)
+            exclude: Item id to skip (e.g. the item being moved)
+        """
+        earliest = start - self._max_span
+        day = earliest.date()
+        last_day = end.date()
+        while day <= last_day:
+            bucket = self._buckets.get(day)
+            if bucket:
+                for index in range(bisect_left(bucket, (earliest,)), len(bucket)):
+                    interval = bucket[index]
+                    if interval[0] >= end:
+                        break
+                    if interval[1] > start and interval[2] != exclude:
+                        yield interval
+            day += timedelta(days=1)
+    
+    def has_overlap(self, start: datetime, end: datetime, exclude: Optional[str] = None) -> bool:
+        """Whether any indexed interval overlaps [start, end)"""
+        return next(self.overlapping(start, end, exclude), None) is not None
+    
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._intervals
+    
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+
+class SpanIndex:
+    """
+    Index of long, possibly open-ended [start, end) spans for overlap queries
+    
+    IntervalIndex suits short intervals (a query scans back by the longest
+    one indexed); spans such as a recurring series can last months. Spans
+    are kept sorted by end, so a query bisects past every span that ended
+    before it and only checks the ones still running: O(log n + k), where k
+    counts spans ending after the query start, however many ended earlier.
+    Starts and ends must all be aware or all naive; an end of None means
+    the span never ends.
+    """
+    
+    def __init__(self, open_end: datetime = datetime.max):
+        self.open_end = open_end
+        self._by_end: List[Tuple[datetime, datetime, str]] = []  # (end, start, item_id), sorted
+        self._spans: Dict[str, Tuple[datetime, datetime]] = {}
+    
+    def add(self, item_id: str, start: datetime, end: Optional[datetime]) -> None:
+        """Index (or move) an item's span"""
+        if item_id in self._spans:
+            self.remove(item_id)
+        end = self.open_end if end is None else end
+        insort(self._by_end, (end, start, item_id))
+        self._spans[item_id] = (start, end)
+    
+    def remove(self, item_id: str) -> None:
+        """Drop an item from the index (no-op if absent)"""
+        span = self._spans.pop(item_id, None)
+        if span is None:
+            return
+        start, end = span
+        del self._by_end[bisect_left(self._by_end, (end, start, item_id))]
+    
+    def overlapping(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[str]:
+        """
+        Yield ids of spans overlapping [start, end), ordered by span end
+        
+        Args:
+            start: Query start (None: unbounded)
+            end: Query end, exclusive (None: unbounded)
+        """
+        lo = bisect_left(self._by_end, (start,)) if start is not None else 0
+        for span_end, span_start, item_id in self._by_end[lo:]:
+            if (start is None or span_end > start) and (end is None or span_start < end):
+                yield item_id
+    
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._spans
+    
+    def __len__(self) -> int:
+        return len(self._spans)
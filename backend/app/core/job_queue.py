@@ -0,0 +1,403 @@
+import asyncio
+import heapq
+import json
+import os
+import random
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+@dataclass
+class Job:
+    """A unit of background work"""
+    id: str
+    name: str
+    payload: Dict[str, Any]
+    attempts: int = 0
+    enqueued_at: float = field(default_factory=time.time)
+    available_at: float = field(default_factory=time.time)
+    last_error: Optional[str] = None
+
+
+class _JobStore:
+    """
+    SQLite backing store so queued jobs survive a restart
+    
+    Every process opening the store loads every pending row on start. A job
+    is only run by the process that claims its row: claim() sets claimed_by
+    in a single conditional UPDATE, so exactly one process wins. A claim
+    expires after `claim_lease` seconds, which lets a later process (a
+    restart after a crash, or another process sharing the store) take over
+    the jobs of one that died mid-run.
+    
+    Not thread-safe: JobQueue makes every call from its one store thread.
+    """
+    
+    def __init__(self, db_path: Path, claim_lease: float = 300.0):
+        self.claim_lease = claim_lease
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, "
+            "name TEXT NOT NULL, "
+            "payload TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL, "
+            "enqueued_at REAL NOT NULL, "
+            "available_at REAL NOT NULL, "
+            "last_error TEXT, "
+            "failed INTEGER NOT NULL DEFAULT 0, "
+            "claimed_by TEXT, "
+            "claimed_until REAL)"
+        )
+        # Stores created before claiming was added
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "claimed_by" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN claimed_by TEXT")
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN claimed_until REAL")
+        self._conn.commit()
+    
+    def load_pending(self) -> List[Job]:
+        rows = self._conn.execute(
+            "SELECT id, name, payload, attempts, enqueued_at, available_at, last_error "
+            "FROM jobs WHERE failed = 0 ORDER BY available_at"
+        ).fetchall()
+        return [
+            Job(
+                id=job_id,
+                name=name,
+                payload=json.loads(payload),
+                attempts=attempts,
+                enqueued_at=enqueued_at,
+                available_at=available_at,
+                last_error=last_error
+            )
+            for job_id, name, payload, attempts, enqueued_at, available_at, last_error in rows
+        ]
+    
+    def claim(self, job_id: str, owner: str) -> Tuple[bool, Optional[float]]:
+        """
+        Atomically claim a pending job
+        
+        Returns:
+            Tuple of (whether this owner now holds the job, when another
+            process's claim on it lapses; None if claimed or the job is gone)
+        """
+        now = time.time()
+        with self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET claimed_by = ?, claimed_until = ? "
+                "WHERE id = ? AND failed = 0 "
+                "AND (claimed_by IS NULL OR claimed_by = ? OR claimed_until < ?)",
+                (owner, now + self.claim_lease, job_id, owner, now)
+            )
+        if cursor.rowcount == 1:
+            return True, None
+        row = self._conn.execute(
+            "SELECT claimed_until FROM jobs WHERE id = ? AND failed = 0", (job_id,)
+        ).fetchone()
+        return False, row[0] if row else None
+    
+    def save(self, job: Job, failed: bool = False) -> None:
+        """Insert or update a job, releasing any claim on it"""
+        self.save_many([job], failed)
+    
+    def save_many(self, jobs: List[Job], failed: bool = False) -> None:
+        """Insert or update several jobs in one transaction"""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO jobs "
+                "(id, name, payload, attempts, enqueued_at, available_at, last_error, failed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        job.id, job.name, json.dumps(job.payload), job.attempts,
+                        job.enqueued_at, job.available_at, job.last_error, int(failed)
+                    )
+                    for job in jobs
+                ]
+            )
+    
+    def delete(self, job_id: str) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+    
+    def close(self) -> None:
+        self._conn.close()
+
+
+class JobQueue:
+    """
+    In-process async job queue
+    
+    Jobs are run by a fixed pool of `concurrency` worker tasks on the event
+    loop. A failing job is retried with exponential backoff and jitter, up to
+    `max_attempts` runs, after which it is dead-lettered (kept in the store
+    with failed = 1 when durable).
+    
+    When started with a db_path, every job is written to SQLite and deleted
+    once it succeeds, so jobs still queued at shutdown (or a crash) are
+    picked up on the next start. SQLite is only touched from one store
+    thread, never the event loop: enqueue() just buffers the job, and the
+    store thread writes everything buffered since its last write in one
+    transaction. Store calls run in submission order, so a job's row is
+    written before any claim on it.
+    
+    Each job's row is claimed before it runs, so a job loaded by several
+    processes sharing the store runs in only one. This app opens the store
+    from a single process (JobService only makes it durable with
+    persistence enabled, and the order log behind it is single-writer), so
+    claims do not contend in normal operation. They matter after a crash:
+    the jobs the dead process had claimed are retried once its lease lapses.
+    Delivery is still at-least-once (a crash between running a job and
+    deleting it re-runs it): handlers must be idempotent.
+    
+    Jobs may be enqueued before start(); they run once the workers start.
+    """
+    
+    def __init__(
+        self,
+        concurrency: int = 4,
+        max_attempts: int = 5,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 60.0,
+        claim_lease: float = 300.0
+    ):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.claim_lease = claim_lease
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        
+        self._handlers: Dict[str, JobHandler] = {}
+        self._ready: Deque[Job] = deque()
+        self._delayed: List[Tuple[float, int, Job]] = []  # heap of (available_at, tiebreak, job)
+        self._tiebreak = 0
+        self._store: Optional[_JobStore] = None
+        self._store_thread: Optional[ThreadPoolExecutor] = None
+        self._unsaved: List[Job] = []  # enqueued jobs waiting for the store thread
+        self._unsaved_lock = threading.Lock()
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._retried = 0
+        self._started_jobs = 0
+        self._total_lag = 0.0
+    
+    def register(self, name: str, handler: JobHandler) -> None:
+        """Register the async handler for a job name"""
+        self._handlers[name] = handler
+    
+    @property
+    def durable(self) -> bool:
+        return self._store is not None
+    
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+    
+    def _schedule(self, job: Job) -> None:
+        if job.available_at <= time.time():
+            self._ready.append(job)
+        else:
+            self._tiebreak += 1
+            heapq.heappush(self._delayed, (job.available_at, self._tiebreak, job))
+        if self._wakeup is not None:
+            self._wakeup.set()
+    
+    def enqueue(self, name: str, payload: Dict[str, Any], delay: float = 0.0) -> str:
+        """
+        Queue a job
+        
+        Args:
+            name: Registered handler name
+            payload: JSON-serialisable job arguments
+            delay: Seconds to wait before the first run
+        
+        Returns:
+            The job id
+        """
+        now = time.time()
+        job = Job(
+            id=f"job_{uuid.uuid4().hex[:12]}",
+            name=name,
+            payload=payload,
+            enqueued_at=now,
+            available_at=now + delay
+        )
+        if self._store is not None:
+            self._save_later(job)
+        self._schedule(job)
+        return job.id
+    
+    def _save_later(self, job: Job) -> None:
+        """Buffer a job for the store thread, scheduling a write if none is pending"""
+        with self._unsaved_lock:
+            self._unsaved.append(job)
+            if len(self._unsaved) > 1:
+                return  # a write is already queued and will pick this job up
+        self._store_thread.submit(self._save_unsaved, self._store)
+    
+    def _save_unsaved(self, store: _JobStore) -> None:
+        """Write every buffered job in one transaction (runs on the store thread)"""
+        with self._unsaved_lock:
+            jobs, self._unsaved = self._unsaved, []
+        if jobs:
+            store.save_many(jobs)
+    
+    async def _in_store_thread(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._store_thread, fn, *args)
+    
+    def _next_ready(self) -> Optional[Job]:
+        """Promote due delayed jobs, then take the oldest ready one"""
+        now = time.time()
+        while self._delayed and self._delayed[0][0] <= now:
+            self._ready.append(heapq.heappop(self._delayed)[2])
+        return self._ready.popleft() if self._ready else None
+    
+    def _retry_delay(self, attempts: int) -> float:
+        delay = min(self.retry_max_delay, self.retry_base_delay * (2 ** (attempts - 1)))
+        return delay * random.uniform(0.5, 1.0)
+    
+    async def _run(self, job: Job) -> None:
+        if self._store is not None:
+            claimed, retry_at = await self._in_store_thread(self._store.claim, job.id, self.owner)
+            if not claimed:
+                if retry_at is not None:
+                    # Held by another (possibly dead) process; try again once its lease lapses
+                    job.available_at = retry_at
+                    self._schedule(job)
+                return
+        started = time.time()
+        self._in_flight += 1
+        self._started_jobs += 1
+        self._total_lag += max(0.0, started - job.available_at)
+        try:
+            handler = self._handlers.get(job.name)
+            if handler is None:
+                raise LookupError(f"No handler registered for job '{job.name}'")
+            await handler(job.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            job.attempts += 1
+            job.last_error = f"{type(exc).__name__}: {exc}"
+            if job.attempts >= self.max_attempts or job.name not in self._handlers:
+                self._failed += 1
+                if self._store is not None:
+                    await self._in_store_thread(self._store.save, job, True)
+            else:
+                self._retried += 1
+                job.available_at = time.time() + self._retry_delay(job.attempts)
+                if self._store is not None:
+                    await self._in_store_thread(self._store.save, job)
+                self._schedule(job)
+        else:
+            self._completed += 1
+            if self._store is not None:
+                await self._in_store_thread(self._store.delete, job.id)
+        finally:
+            self._in_flight -= 1
+    
+    async def _worker(self) -> None:
+        while True:
+            job = self._next_ready()
+            if job is None:
+                # Ready jobs are drained on shutdown; delayed ones stay queued
+                if self._stopping:
+                    return
+                timeout = self._delayed[0][0] - time.time() if self._delayed else None
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+    
+    async def start(self, db_path: Optional[Path] = None) -> None:
+        """
+        Start the worker pool
+        
+        Args:
+            db_path: Optional SQLite file backing the queue; pending jobs
+                found there are re-queued
+        """
+        if self.running:
+            return
+        if db_path is not None:
+            self._store_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-store")
+            self._store = await self._in_store_thread(_JobStore, Path(db_path), self.claim_lease)
+            queued = list(self._ready) + [entry[2] for entry in self._delayed]
+            await self._in_store_thread(self._store.save_many, queued)
+            pending = await self._in_store_thread(self._store.load_pending)
+            # Jobs enqueued while awaiting the store are queued already
+            queued_ids = {job.id for job in self._ready} | {entry[2].id for entry in self._delayed}
+            for job in pending:
+                if job.id not in queued_ids:
+                    self._schedule(job)
+        
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+    
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Let workers drain ready jobs for up to `timeout` seconds, then stop"""
+        if not self.running:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        
+        done, pending = await asyncio.wait(self._workers, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._workers = []
+        self._wakeup = None
+        
+        if self._store is not None:
+            store, self._store = self._store, None
+            await self._in_store_thread(self._save_unsaved, store)
+            await self._in_store_thread(store.close)
+            self._store_thread.shutdown()
+            self._store_thread = None
+            # Whatever is left is persisted and will be reloaded on start
+            self._ready.clear()
+            self._delayed = []
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Current depth, lag and throughput counters"""
+        now = time.time()
+        oldest_lag = max(0.0, now - self._ready[0].available_at) if self._ready else 0.0
+        return {
+            "depth": len(self._ready),
+            "delayed": len(self._delayed),
+            "in_flight": self._in_flight,
+            "oldest_lag_seconds": round(oldest_lag, 3),
+            "average_lag_seconds": round(self._total_lag / self._started_jobs, 3) if self._started_jobs else 0.0,
+            "completed": self._completed,
+            "failed": self._failed,
+            "retried": self._retried,
+            "concurrency": self.concurrency,
+            "durable": self.durable,
+            "running": self.running
+        }
@@ -0,0 +1,72 @@
+import calendar
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+
+WEEKLY = "weekly"
+MONTHLY = "monthly"
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    """Shift by whole months, clamping the day to the target month's length"""
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def _months_between(earlier: datetime, later: datetime) -> int:
+    return (later.year - earlier.year) * 12 + later.month - earlier.month
+
+
+def iter_occurrences(
+    dtstart: datetime,
+    frequency: str,
+    interval: int = 1,
+    count: Optional[int] = None,
+    until: Optional[datetime] = None,
+    window_start: Optional[datetime] = None,
+    window_end: Optional[datetime] = None
+) -> Iterator[datetime]:
+    """
+    Lazily expand a weekly or monthly recurrence rule
+    
+    The expansion jumps straight to the first occurrence at or after
+    window_start, so only occurrences inside the window are ever generated,
+    whatever the series length.
+    
+    Args:
+        dtstart: First occurrence
+        frequency: "weekly" or "monthly"
+        interval: Repeat every `interval` weeks/months
+        count: Total number of occurrences in the series (None: unbounded)
+        until: Last allowed occurrence start, inclusive (None: unbounded)
+        window_start: Only yield occurrences starting at or after this
+        window_end: Only yield occurrences starting before this
+    
+    Yields:
+        Occurrence start times in ascending order
+    """
+    if frequency == WEEKLY:
+        step = timedelta(weeks=interval)
+        index = 0
+        if window_start is not None and window_start > dtstart:
+            index = -((dtstart - window_start) // step)  # ceiling division
+        occurrence_at = lambda k: dtstart + step * k
+    elif frequency == MONTHLY:
+        index = 0
+        if window_start is not None and window_start > dtstart:
+            # Day clamping can pull an occurrence earlier, so start one step back
+            index = max(0, _months_between(dtstart, window_start) // interval - 1)
+        occurrence_at = lambda k: _add_months(dtstart, interval * k)
+    else:
+        raise ValueError(f"Unsupported recurrence frequency '{frequency}'")
+    
+    while count is None or index < count:
+        occurrence = occurrence_at(index)
+        if (until is not None and occurrence > until) or (window_end is not None and occurrence >= window_end):
+            return
+        if window_start is None or occurrence >= window_start:
+            yield occurrence
+        index += 1
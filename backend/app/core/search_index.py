@@ -0,0 +1,70 @@
+from typing import Dict, Iterable, Optional, Set
+
+
+class NgramIndex:
+    """
+    Character n-gram inverted index for case-insensitive substring search
+    
+    Every indexed field is split into overlapping n-grams and each n-gram maps
+    to the set of document ids containing it. A query's candidate set is the
+    intersection of its n-gram posting sets, which is an upper bound on the
+    documents containing the query; callers still verify the actual match.
+    """
+    
+    def __init__(self, n: int = 3):
+        self.n = n
+        self._postings: Dict[str, Set[str]] = {}
+        self._doc_grams: Dict[str, Set[str]] = {}
+    
+    def _grams(self, text: str) -> Set[str]:
+        """Split lowercased text into its n-grams"""
+        text = text.lower()
+        return {text[i:i + self.n] for i in range(len(text) - self.n + 1)}
+    
+    def add(self, doc_id: str, fields: Iterable[str]) -> None:
+        """Index (or re-index) a document from its searchable fields"""
+        if doc_id in self._doc_grams:
+            self.remove(doc_id)
+        
+        grams: Set[str] = set()
+        for field in fields:
+            if field:
+                grams |= self._grams(field)
+        
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(doc_id)
+        self._doc_grams[doc_id] = grams
+    
+    def remove(self, doc_id: str) -> None:
+        """Drop a document from the index"""
+        for gram in self._doc_grams.pop(doc_id, set()):
+            posting = self._postings.get(gram)
+            if posting is None:
+                continue
+            posting.discard(doc_id)
+            if not posting:
+                del self._postings[gram]
+    
+    def candidates(self, query: str) -> Optional[Set[str]]:
+        """
+        Get ids of documents that may contain query
+        
+        Returns:
+            Candidate id set, or None if the query is shorter than n and the
+            index cannot narrow the search
+        """
+        grams = self._grams(query)
+        if not grams:
+            return None
+        
+        # Intersect smallest posting sets first
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            if not result:
+                break
+            result &= posting
+        return result
+    
+    def __len__(self) -> int:
+        return len(self._doc_grams)
@@ -0,0 +1,93 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+class SequenceAllocator:
+    """
+    Hi/lo sequence allocator backed by a local SQLite database
+    
+    Each process leases a block of `block_size` values per sequence name in a
+    short `BEGIN IMMEDIATE` transaction, then hands values out from memory.
+    Several worker processes sharing the same database never collide, only
+    touch the database once per block, and values stay mostly sequential
+    (a restarted worker skips the rest of its unused block).
+    
+    With no db_path, blocks are leased from an in-process table instead.
+    """
+    
+    def __init__(self, db_path: Optional[Path] = None, block_size: int = 20):
+        self.db_path = Path(db_path) if db_path else None
+        self.block_size = block_size
+        
+        self._lock = threading.Lock()
+        self._ranges: Dict[str, Tuple[int, int]] = {}  # name -> (next value, block limit)
+        self._memory_table: Dict[str, int] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Open (or reopen after fork) the SQLite connection"""
+        if self._conn is None or self._conn_pid != os.getpid():
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sequences ("
+                "name TEXT PRIMARY KEY, next_value INTEGER NOT NULL)"
+            )
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+    
+    def _reserve(self, name: str, count: int, minimum: int = 1) -> int:
+        """Atomically reserve `count` values, returning the first one"""
+        if self.db_path is None:
+            start = max(self._memory_table.get(name, 1), minimum)
+            self._memory_table[name] = start + count
+            return start
+        
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT next_value FROM sequences WHERE name = ?", (name,)).fetchone()
+            start = max(row[0] if row else 1, minimum)
+            conn.execute(
+                "INSERT INTO sequences (name, next_value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET next_value = excluded.next_value",
+                (name, start + count)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return start
+    
+    def next_value(self, name: str) -> int:
+        """Get the next value for a sequence, leasing a new block when needed"""
+        with self._lock:
+            current, limit = self._ranges.get(name, (0, 0))
+            if current >= limit:
+                current = self._reserve(name, self.block_size)
+                limit = current + self.block_size
+            self._ranges[name] = (current + 1, limit)
+            return current
+    
+    def ensure_at_least(self, name: str, value: int) -> None:
+        """Make sure future values of a sequence are >= value"""
+        with self._lock:
+            self._reserve(name, 0, minimum=value)
+            current, limit = self._ranges.get(name, (0, 0))
+            if current < value < limit:
+                self._ranges[name] = (value, limit)
+            elif current < value:
+                self._ranges.pop(name, None)
+    
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
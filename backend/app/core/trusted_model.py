@@ -0,0 +1,75 @@
+from functools import lru_cache
+from typing import Any, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class _Probe(BaseModel):
+    name: str
+    count: int
+    note: Optional[str] = None
+
+
+def _write_instance(model_cls: Type[ModelT], values: dict) -> ModelT:
+    instance = model_cls.__new__(model_cls)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__pydantic_fields_set__", set(values))
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
+
+
+@lru_cache(maxsize=1)
+def _instance_layout_supported() -> bool:
+    """
+    Check once that the installed pydantic still lays out model instances the
+    way _write_instance assumes (it writes pydantic's internal slots directly)
+
+    Returns:
+        True if a directly written instance is indistinguishable from a
+        validated one: equality, model_dump, model_fields_set and copying
+    """
+    data = {"name": "probe", "count": 3, "note": None}
+    try:
+        trusted = _write_instance(_Probe, dict(data))
+        validated = _Probe(**data)
+        return (
+            trusted == validated
+            and trusted.model_dump() == validated.model_dump()
+            and trusted.model_fields_set == validated.model_fields_set
+            and trusted.model_copy(update={"count": 4}).count == 4
+        )
+    except Exception:
+        return False
+
+
+def trusted_construct(model_cls: Type[ModelT], **values: Any) -> ModelT:
+    """
+    Build a model instance from trusted, already-valid data without validation
+
+    Equivalent to model_cls.model_construct(**values) for the case where every
+    field is passed by its field name (not alias), but without the per-field
+    alias and default resolution that makes model_construct slower than
+    validation for small models on pydantic 2.x. Use only for values the
+    server produced or validated itself.
+
+    The fast path writes pydantic's instance internals directly, so it is only
+    taken while a one-time self-check confirms the installed pydantic still
+    matches that layout; otherwise this falls back to model_construct.
+
+    Raises:
+        TypeError: if values does not cover every field of the model
+    """
+    if len(values) != len(model_cls.model_fields):
+        missing = set(model_cls.model_fields) - set(values)
+        unknown = set(values) - set(model_cls.model_fields)
+        raise TypeError(
+            f"trusted_construct({model_cls.__name__}) needs exactly its fields; "
+            f"missing={sorted(missing)} unknown={sorted(unknown)}"
+        )
+    if not _instance_layout_supported():
+        return model_cls.model_construct(**values)
+    return _write_instance(model_cls, values)
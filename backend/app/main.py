@@ -1,11 +1,27 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import products, categories, cart, order, checkout, pets, appointments, vet_appointments, adoption, admin_adoption
+from app.api.routes import products, categories, cart, order, admin_order, checkout, pets, appointments, vet_appointments, adoption, admin_adoption, admin_payment_methods, jobs
 from app.services.category_service import CategoryService
 from app.services.product_service import ProductService
 from app.services.checkout_service import CheckoutService
 from app.services.adoption_service import AdoptionService
 from app.services.pet_service import PetService
+from app.services.clinic_resource_service import ClinicResourceService
+from app.services.order_service import OrderService
+from app.services.job_service import JobService
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Restore durable state and start background workers; stop and flush on shutdown"""
+    OrderService.initialize_persistence()
+    OrderService.register_jobs()
+    await JobService.start()
+    yield
+    await JobService.stop()
+    OrderService.close_persistence()
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -13,7 +29,8 @@ app = FastAPI(
     description="Production-ready FastAPI backend API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware configuration
@@ -30,17 +47,21 @@ CheckoutService.initialize_mock_data()
 ProductService.initialize_mock_data()
 AdoptionService.initialize_mock_data()
 PetService.initialize_mock_data()
+ClinicResourceService.initialize_mock_data()
 
 app.include_router(products.router, prefix="/api", tags=["Products"])
 app.include_router(categories.router, prefix="/api", tags=["Categories"])  
 app.include_router(cart.router, prefix="/api", tags=["Cart"])  
 app.include_router(order.router, prefix="/api", tags=["Orders"])  
+app.include_router(admin_order.router, prefix="/api", tags=["Admin Orders"]) 
 app.include_router(checkout.router, prefix="/api", tags=["Checkout"]) 
+app.include_router(admin_payment_methods.router, prefix="/api", tags=["Admin Payment Methods"]) 
 app.include_router(pets.router, prefix="/api", tags=["Pets"]) 
 app.include_router(appointments.router, prefix="/api", tags=["Appointments"]) 
 app.include_router(vet_appointments.router, prefix="/api", tags=["Vet Appointments"]) 
 app.include_router(adoption.router, prefix="/api", tags=["Adoption"]) 
 app.include_router(admin_adoption.router, prefix="/api", tags=["Admin Adoption"]) 
+app.include_router(jobs.router, prefix="/api", tags=["Admin Jobs"]) 
 
 @app.get("/")
 async def root():
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, Literal
 from enum import Enum
 from app.models.pet import Pet
@@ -25,15 +25,42 @@ class AppointmentType(str, Enum):
     OTHER = "other"
 
 
+class ResourceType(str, Enum):
+    """Kind of clinic resource an appointment occupies"""
+    VET = "vet"
+    ROOM = "room"
+
+
+class ClinicResource(BaseModel):
+    """A bookable clinic resource (veterinarian or room)"""
+    id: str
+    name: str
+    type: ResourceType
+    
+    class Config:
+        use_enum_values = True
+
+
+class PetSummary(BaseModel):
+    """Denormalized pet fields kept on appointments for listing and search"""
+    name: str
+    species: str
+    breed: str
+
+
 class Appointment(BaseModel):
     """Appointment model"""
     id: str
     pet_id: str = Field(..., alias="petId")
-    pet: Pet
+    pet_summary: PetSummary = Field(..., alias="petSummary")
+    pet: Optional[Pet] = None  # resolved from PetService when returned, not stored
     owner_id: str = Field(..., alias="ownerId")
     owner_name: str = Field(..., alias="ownerName")
     appointment_date_time: datetime = Field(..., alias="appointmentDateTime")
     duration: int = Field(..., ge=15, le=480)  # 15 min to 8 hours
+    vet_id: Optional[str] = Field(None, alias="vetId")
+    room_id: Optional[str] = Field(None, alias="roomId")
+    series_id: Optional[str] = Field(None, alias="seriesId")  # set on occurrences of a recurring series
     status: AppointmentStatus
     appointment_type: AppointmentType = Field(..., alias="appointmentType")
     reason: str
@@ -57,6 +84,61 @@ class BookAppointmentInput(BaseModel):
     appointment_type: AppointmentType = Field(..., alias="appointmentType")
     reason: str = Field(..., min_length=1, max_length=500)
     notes: Optional[str] = Field(None, max_length=1000)
+    vet_id: Optional[str] = Field(None, alias="vetId")  # auto-assigned if omitted
+    room_id: Optional[str] = Field(None, alias="roomId")  # auto-assigned if omitted
+    
+    class Config:
+        populate_by_name = True
+        use_enum_values = True
+
+
+class RecurrenceFrequency(str, Enum):
+    """How often a recurring appointment repeats"""
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+
+
+class RecurrenceRule(BaseModel):
+    """Recurrence rule (RRULE subset); one of count or until is required"""
+    frequency: RecurrenceFrequency
+    interval: int = Field(1, ge=1, le=12)
+    count: Optional[int] = Field(None, ge=1)
+    until: Optional[datetime] = None
+    
+    class Config:
+        use_enum_values = True
+
+
+class BookAppointmentSeriesInput(BookAppointmentInput):
+    """Input for booking a recurring appointment series"""
+    recurrence: RecurrenceRule
+
+
+class AppointmentSeries(BaseModel):
+    """
+    Recurring appointment series
+    
+    Stored as its rule plus the start times of occurrences the rule no longer
+    generates; occurrences are expanded on demand for the queried window.
+    """
+    id: str
+    pet_id: str = Field(..., alias="petId")
+    pet_summary: PetSummary = Field(..., alias="petSummary")
+    pet: Optional[Pet] = None  # resolved from PetService when returned, not stored
+    owner_id: str = Field(..., alias="ownerId")
+    owner_name: str = Field(..., alias="ownerName")
+    first_date_time: datetime = Field(..., alias="firstDateTime")
+    duration: int = Field(..., ge=15, le=480)
+    vet_id: str = Field(..., alias="vetId")
+    room_id: str = Field(..., alias="roomId")
+    status: AppointmentStatus
+    appointment_type: AppointmentType = Field(..., alias="appointmentType")
+    reason: str
+    notes: Optional[str] = None
+    recurrence: RecurrenceRule
+    exceptions: list[datetime] = Field(default_factory=list)  # starts of occurrences stored as their own appointments once edited, cancelled or rescheduled
+    created_at: datetime = Field(..., alias="createdAt")
+    updated_at: datetime = Field(..., alias="updatedAt")
     
     class Config:
         populate_by_name = True
@@ -97,4 +179,55 @@ class UpdateAppointmentStatusInput(BaseModel):
     treatment: Optional[str] = Field(None, max_length=2000)
     
     class Config:
-        use_enum_values = True
\ No newline at end of file
+        use_enum_values = True
+
+
+class AvailableSlot(BaseModel):
+    """A free appointment slot"""
+    start: datetime
+    end: datetime
+
+
+class AvailabilityResponse(BaseModel):
+    """Free appointment slots in a date range"""
+    start_date: date = Field(..., alias="startDate")
+    end_date: date = Field(..., alias="endDate")
+    duration: int
+    slots: list[AvailableSlot]
+    has_more: bool = Field(..., alias="hasMore")
+    
+    class Config:
+        populate_by_name = True
+
+
+class BulkBookAppointmentInput(BookAppointmentInput):
+    """One booking in a bulk request; pets belong to different owners, so each names its owner"""
+    owner_name: str = Field(..., alias="ownerName", min_length=1, max_length=200)
+
+
+class BulkBookAppointmentsRequest(BaseModel):
+    """Request to book many appointments at once (e.g. a vaccination drive)"""
+    appointments: list[BulkBookAppointmentInput] = Field(..., min_length=1, max_length=1000)
+
+
+class BulkAppointmentResult(BaseModel):
+    """Per-request outcome of a bulk booking, by position in the request"""
+    index: int
+    success: bool
+    appointment: Optional[Appointment] = None
+    error: Optional[str] = None
+    status_code: Optional[int] = Field(None, alias="statusCode")
+    
+    class Config:
+        populate_by_name = True
+
+
+class BulkBookAppointmentsResponse(BaseModel):
+    """Response for bulk appointment booking"""
+    success: bool = True
+    succeeded: int = Field(..., ge=0)
+    failed: int = Field(..., ge=0)
+    results: list[BulkAppointmentResult]
+    
+    class Config:
+        populate_by_name = True
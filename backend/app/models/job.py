@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+
+
+class JobQueueMetrics(BaseModel):
+    """Background job queue depth, lag and throughput"""
+    depth: int = Field(..., ge=0, description="Jobs ready to run")
+    delayed: int = Field(..., ge=0, description="Jobs waiting for a retry backoff")
+    in_flight: int = Field(..., ge=0, alias="inFlight")
+    oldest_lag_seconds: float = Field(..., ge=0, alias="oldestLagSeconds")
+    average_lag_seconds: float = Field(..., ge=0, alias="averageLagSeconds")
+    completed: int = Field(..., ge=0)
+    failed: int = Field(..., ge=0)
+    retried: int = Field(..., ge=0)
+    concurrency: int = Field(..., gt=0)
+    durable: bool
+    running: bool
+    
+    class Config:
+        populate_by_name = True
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import List, Optional, Literal
+from typing import Annotated, Dict, List, Optional, Literal
 from enum import Enum
 
 
@@ -227,6 +227,102 @@ class OrdersResponse(BaseModel):
         from_attributes = True
 
 
+class BatchShipItem(BaseModel):
+    """Single order in a batch ship request"""
+    order_id: str = Field(..., alias="orderId")
+    carrier: str
+    tracking_number: str = Field(..., alias="trackingNumber")
+    tracking_url: str = Field(..., alias="trackingUrl")
+    estimated_delivery: str = Field(..., alias="estimatedDelivery")
+    
+    class Config:
+        populate_by_name = True
+
+
+class BatchShipRequest(BaseModel):
+    """Request to ship many orders at once"""
+    items: List[BatchShipItem] = Field(..., min_length=1, max_length=1000)
+
+
+class BatchStatusItem(BaseModel):
+    """Single order in a batch status request"""
+    order_id: str = Field(..., alias="orderId")
+    status: OrderStatusEnum
+    note: Optional[str] = None
+    
+    class Config:
+        populate_by_name = True
+
+
+class BatchStatusRequest(BaseModel):
+    """Request to change the status of many orders at once"""
+    items: List[BatchStatusItem] = Field(..., min_length=1, max_length=1000)
+
+
+class BatchOrderResult(BaseModel):
+    """Per-order outcome of a batch operation"""
+    order_id: str = Field(..., alias="orderId")
+    success: bool
+    status: Optional[OrderStatusEnum] = None
+    error: Optional[str] = None
+    
+    class Config:
+        populate_by_name = True
+
+
+class BatchOrderResponse(BaseModel):
+    """Response for batch order operations"""
+    success: bool = True
+    succeeded: int = Field(..., ge=0)
+    failed: int = Field(..., ge=0)
+    results: List[BatchOrderResult]
+    
+    class Config:
+        populate_by_name = True
+
+
+class ArchiveOrdersResponse(BaseModel):
+    """Response for an order archival run"""
+    success: bool = True
+    archived: int = Field(..., ge=0)
+
+
+class DailyRevenue(BaseModel):
+    """Revenue rollup for a single day"""
+    date: str
+    revenue: float
+    orders: int
+    
+    class Config:
+        from_attributes = True
+
+
+class ProductSales(BaseModel):
+    """Units and revenue rollup for a single product"""
+    product_id: str = Field(..., alias="productId")
+    product_name: str = Field(..., alias="productName")
+    units: int
+    revenue: float
+    
+    class Config:
+        populate_by_name = True
+        from_attributes = True
+
+
+class OrderAnalyticsResponse(BaseModel):
+    """Response for order sales analytics"""
+    success: bool = True
+    total_revenue: float = Field(..., alias="totalRevenue")
+    total_orders: int = Field(..., alias="totalOrders")
+    status_counts: Dict[str, int] = Field(..., alias="statusCounts")
+    daily_revenue: List[DailyRevenue] = Field(..., alias="dailyRevenue")
+    top_products: List[ProductSales] = Field(..., alias="topProducts")
+    
+    class Config:
+        populate_by_name = True
+        from_attributes = True
+
+
 # Request Models
 class CheckoutRequest(BaseModel):
     """Request model for creating an order"""
@@ -377,6 +473,7 @@ class CheckoutDataInput(BaseModel):
     shipping_address: ShippingAddressInput = Field(..., alias="shippingAddress")
     payment_method: PaymentMethodInput = Field(..., alias="paymentMethod")
     order_summary: OrderSummary = Field(..., alias="orderSummary")
+    session_id: Optional[str] = Field(None, alias="sessionId", description="Checkout session to reuse validated steps from")
     
     class Config:
         populate_by_name = True
@@ -416,6 +513,41 @@ class ShippingCalculationResponse(BaseModel):
         from_attributes = True
 
 
+class BatchCardValidationRequest(BaseModel):
+    """Request model for validating card numbers in bulk"""
+    card_numbers: List[Annotated[str, Field(max_length=32)]] = Field(..., alias="cardNumbers", min_length=1, max_length=10000)
+    
+    class Config:
+        populate_by_name = True
+        json_schema_extra = {
+            "example": {
+                "cardNumbers": ["4242 4242 4242 4242", "5555-5555-5555-4444", "1234567812345678"]
+            }
+        }
+
+
+class CardValidationResult(BaseModel):
+    """Validation result for one card number (never echoes the full number)"""
+    index: int
+    valid: bool
+    brand: str
+    last4: str
+    
+    class Config:
+        populate_by_name = True
+
+
+class BatchCardValidationResponse(BaseModel):
+    """Response for bulk card validation"""
+    success: bool = True
+    valid_count: int = Field(..., ge=0, alias="validCount")
+    invalid_count: int = Field(..., ge=0, alias="invalidCount")
+    results: List[CardValidationResult]
+    
+    class Config:
+        populate_by_name = True
+
+
 class PaymentMethodResponse(BaseModel):
     """Saved payment method response"""
     id: str
@@ -442,3 +574,54 @@ class PaymentMethodResponse(BaseModel):
                 "cardholderName": "John Doe"
             }
         }
+
+
+class UserPaymentMethods(BaseModel):
+    """A user's saved payment methods (admin view)"""
+    user_id: str = Field(..., alias="userId")
+    default_payment_method_id: Optional[str] = Field(None, alias="defaultPaymentMethodId")
+    payment_methods: List[PaymentMethodResponse] = Field(..., alias="paymentMethods")
+    
+    class Config:
+        populate_by_name = True
+
+
+class AdminPaymentMethodsResponse(BaseModel):
+    """Response for the admin bulk payment method listing"""
+    success: bool = True
+    users: List[UserPaymentMethods]
+    pagination: OrderPagination
+    
+    class Config:
+        populate_by_name = True
+
+
+class CreateCheckoutSessionRequest(BaseModel):
+    """Request model for starting a checkout session"""
+    shipping_address: ShippingAddressInput = Field(..., alias="shippingAddress")
+    shipping_method: str = Field("standard", alias="shippingMethod")
+    
+    class Config:
+        populate_by_name = True
+
+
+class CheckoutSession(BaseModel):
+    """
+    Server-side checkout state memoized between checkout steps
+    
+    Holds the validated address, the shipping quote and the versions of the
+    cart and of the products in it that they were computed against.
+    """
+    id: str
+    user_id: str = Field(..., exclude=True)
+    shipping_address: ShippingAddressInput = Field(..., alias="shippingAddress")
+    shipping_method: str = Field(..., alias="shippingMethod")
+    shipping: ShippingCalculationResponse
+    order_summary: OrderSummary = Field(..., alias="orderSummary")
+    cart_version: int = Field(..., alias="cartVersion")
+    product_versions: Dict[str, int] = Field(..., exclude=True)
+    created_at: datetime = Field(..., alias="createdAt")
+    expires_at: datetime = Field(..., alias="expiresAt")
+    
+    class Config:
+        populate_by_name = True
@@ -0,0 +1,230 @@
+from typing import AsyncIterator, Iterable, List, Optional
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+import asyncio
+
+from app.models.appointment import (
+    Appointment, AppointmentSeries, AppointmentStatus, AppointmentType, RecurrenceFrequency
+)
+from app.services.appointment_service import AppointmentService
+from app.services.clinic_resource_service import ClinicResourceService
+
+
+class AppointmentCalendarService:
+    """Service layer for iCalendar (.ics) appointment feeds"""
+    
+    CHUNK_SIZE = 200  # events per streamed chunk
+    MEDIA_TYPE = "text/calendar; charset=utf-8"
+    PRODUCT_ID = "-//PetCare//Appointments//EN"
+    UID_DOMAIN = "petcare"
+    MAX_LINE_OCTETS = 75
+    
+    # RFC 5545 VEVENT status per appointment status
+    EVENT_STATUS = {
+        AppointmentStatus.SCHEDULED: "TENTATIVE",
+        AppointmentStatus.CONFIRMED: "CONFIRMED",
+        AppointmentStatus.IN_PROGRESS: "CONFIRMED",
+        AppointmentStatus.COMPLETED: "CONFIRMED",
+        AppointmentStatus.CANCELLED: "CANCELLED",
+        AppointmentStatus.NO_SHOW: "CANCELLED"
+    }
+    
+    @classmethod
+    def _escape(cls, text: str) -> str:
+        """Escape a TEXT property value"""
+        return (
+            text.replace("\\", "\\\\")
+            .replace(";", "\\;")
+            .replace(",", "\\,")
+            .replace("\r\n", "\\n")
+            .replace("\n", "\\n")
+        )
+    
+    @classmethod
+    def _fold(cls, line: str) -> str:
+        """Fold a content line to at most 75 octets per physical line"""
+        if len(line.encode("utf-8")) <= cls.MAX_LINE_OCTETS:
+            return line + "\r\n"
+        parts = []
+        current = ""
+        size = 0
+        for char in line:
+            char_size = len(char.encode("utf-8"))
+            # Continuation lines start with a space, which counts towards the limit
+            if size + char_size > cls.MAX_LINE_OCTETS - (1 if parts else 0):
+                parts.append(current)
+                current = ""
+                size = 0
+            current += char
+            size += char_size
+        parts.append(current)
+        return "\r\n ".join(parts) + "\r\n"
+    
+    @staticmethod
+    def _format_utc(value: datetime) -> str:
+        """DATE-TIME in UTC form; naive values are taken as UTC"""
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.strftime("%Y%m%dT%H%M%SZ")
+    
+    @classmethod
+    def _event(
+        cls,
+        uid: str,
+        start: datetime,
+        duration: int,
+        status: str,
+        appointment_type: str,
+        pet_name: str,
+        owner_name: str,
+        reason: str,
+        notes: Optional[str],
+        vet_id: Optional[str],
+        room_id: Optional[str],
+        updated_at: datetime,
+        recurrence_lines: Iterable[str] = ()
+    ) -> str:
+        """Render one VEVENT"""
+        vet = ClinicResourceService.get_resource(vet_id) if vet_id else None
+        room = ClinicResourceService.get_resource(room_id) if room_id else None
+        description = reason
+        if vet:
+            description += f"\nVet: {vet.name}"
+        if notes:
+            description += f"\n{notes}"
+        
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:{uid}@{cls.UID_DOMAIN}",
+            f"DTSTAMP:{cls._format_utc(updated_at)}",
+            f"LAST-MODIFIED:{cls._format_utc(updated_at)}",
+            f"DTSTART:{cls._format_utc(start)}",
+            f"DTEND:{cls._format_utc(start + timedelta(minutes=duration))}",
+            *recurrence_lines,
+            f"SUMMARY:{cls._escape(f'{AppointmentType(appointment_type).value.capitalize()}: {pet_name} ({owner_name})')}",
+            f"DESCRIPTION:{cls._escape(description)}",
+            f"STATUS:{cls.EVENT_STATUS[AppointmentStatus(status)]}"
+        ]
+        if room:
+            lines.append(f"LOCATION:{cls._escape(room.name)}")
+        lines.append("END:VEVENT")
+        return "".join(cls._fold(line) for line in lines)
+    
+    @classmethod
+    def _appointment_event(cls, appointment: Appointment) -> str:
+        return cls._event(
+            appointment.id,
+            appointment.appointment_date_time,
+            appointment.duration,
+            appointment.status,
+            appointment.appointment_type,
+            appointment.pet_summary.name,
+            appointment.owner_name,
+            appointment.reason,
+            appointment.notes,
+            appointment.vet_id,
+            appointment.room_id,
+            appointment.updated_at
+        )
+    
+    @classmethod
+    def _series_event(cls, series: AppointmentSeries) -> str:
+        """A series is a single VEVENT with RRULE and EXDATEs, expanded by the client"""
+        rule = series.recurrence
+        rrule = f"RRULE:FREQ={rule.frequency.upper()};INTERVAL={rule.interval}"
+        if rule.frequency == RecurrenceFrequency.MONTHLY and series.first_date_time.day > 28:
+            # Occurrences clamp to the month's last day; express that as "last of days 28..N"
+            days = ",".join(str(day) for day in range(28, series.first_date_time.day + 1))
+            rrule += f";BYMONTHDAY={days};BYSETPOS=-1"
+        if rule.count is not None:
+            rrule += f";COUNT={rule.count}"
+        if rule.until is not None:
+            rrule += f";UNTIL={cls._format_utc(rule.until)}"
+        recurrence_lines = [rrule] + [
+            f"EXDATE:{cls._format_utc(exception)}" for exception in sorted(series.exceptions)
+        ]
+        return cls._event(
+            series.id,
+            series.first_date_time,
+            series.duration,
+            series.status,
+            series.appointment_type,
+            series.pet_summary.name,
+            series.owner_name,
+            series.reason,
+            series.notes,
+            series.vet_id,
+            series.room_id,
+            series.updated_at,
+            recurrence_lines
+        )
+    
+    @classmethod
+    async def stream_feed(
+        cls,
+        calendar_name: str,
+        first_day: Optional[date] = None,
+        last_day: Optional[date] = None,
+        owner_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a VCALENDAR of appointments in chunks of CHUNK_SIZE events
+        
+        One-off appointments come straight off the date-partitioned (or
+        per-owner) indexes in time order; recurring series follow as RRULE
+        events.
+        
+        Args:
+            calendar_name: X-WR-CALNAME shown by calendar clients
+            first_day: Earliest appointment day to include
+            last_day: Latest appointment day to include
+            owner_id: Only this owner's appointments
+        """
+        yield "".join(cls._fold(line) for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{cls.PRODUCT_ID}",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{cls._escape(calendar_name)}"
+        ))
+        
+        events: List[str] = []
+        for appointment in AppointmentService.iter_appointments(first_day, last_day, owner_id):
+            events.append(cls._appointment_event(appointment))
+            if len(events) == cls.CHUNK_SIZE:
+                yield "".join(events)
+                events = []
+                await asyncio.sleep(0)  # let other requests run between chunks
+        for series in AppointmentService.get_series_list(first_day, last_day, owner_id):
+            events.append(cls._series_event(series))
+        
+        events.append(cls._fold("END:VCALENDAR"))
+        yield "".join(events)
+    
+    @staticmethod
+    def format_http_date(value: datetime) -> str:
+        """RFC 7231 HTTP-date for a (naive UTC or aware) datetime"""
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+    
+    @staticmethod
+    def is_not_modified(last_modified: Optional[datetime], if_modified_since: Optional[str]) -> bool:
+        """
+        Whether a conditional request can be answered with 304
+        
+        HTTP dates have one-second resolution, so last_modified is truncated
+        before comparing.
+        """
+        if last_modified is None or not if_modified_since:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
@@ -1,13 +1,30 @@
-from typing import Dict, List, Optional
-from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+from datetime import date, datetime, time, timedelta, timezone
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from itertools import islice
 from fastapi import HTTPException, status
+import heapq
 import uuid
 
 from app.models.appointment import (
     Appointment, BookAppointmentInput, RescheduleAppointmentInput,
-    AppointmentsResponse, AppointmentPagination, AppointmentStatus, AppointmentType
+    AppointmentsResponse, AppointmentPagination, AppointmentStatus, AppointmentType,
+    AvailabilityResponse, AvailableSlot, ResourceType,
+    AppointmentSeries, BookAppointmentSeriesInput, PetSummary,
+    BulkBookAppointmentInput, BulkAppointmentResult, BulkBookAppointmentsResponse
 )
+from app.models.pet import Pet
 from app.services.pet_service import PetService
+from app.services.clinic_resource_service import ClinicResourceService
+from app.core.interval_index import IntervalIndex, SpanIndex
+from app.core.search_index import NgramIndex
+from app.core.recurrence import iter_occurrences
+from app.core import config
+
+
+# Appointment or AppointmentSeries (both carry pet_id / pet)
+PetLinkedT = TypeVar("PetLinkedT", Appointment, AppointmentSeries)
 
 
 class AppointmentService:
@@ -15,6 +32,46 @@ class AppointmentService:
     
     _appointments: Dict[str, Appointment] = {}
     
+    # Appointment ids partitioned by calendar day, each bucket sorted by (start, id)
+    _appointments_by_day: Dict[date, List[Tuple[datetime, str]]] = {}
+    
+    # Sorted keys of _appointments_by_day
+    _appointment_days: List[date] = []
+    
+    # Appointment ids per owner and per pet, sorted by (start, id)
+    _appointments_by_owner: Dict[str, List[Tuple[datetime, str]]] = {}
+    _appointments_by_pet: Dict[str, List[Tuple[datetime, str]]] = {}
+    
+    # Per-resource (vet or room) time slots held by appointments that still block the calendar
+    _resource_indexes: Dict[str, IntervalIndex] = {}
+    
+    # Minutes booked per (resource, day), used to balance auto-assignment
+    _resource_load: Dict[Tuple[str, date], int] = {}
+    
+    # Resources, day and minutes each indexed appointment is counted against
+    _indexed_resources: Dict[str, Tuple[Tuple[str, ...], date, int]] = {}
+    
+    # Recurring series; the spans (first start to last end) of all series, and of active series per resource;
+    # and the ids of all series per owner and per pet
+    _series: Dict[str, AppointmentSeries] = {}
+    _series_spans = SpanIndex(open_end=datetime.max.replace(tzinfo=timezone.utc))
+    _series_by_resource: Dict[str, SpanIndex] = {}
+    _series_by_owner: Dict[str, Set[str]] = {}
+    _series_by_pet: Dict[str, Set[str]] = {}
+    
+    # Appointment and series ids by owner and pet name
+    _search_index = NgramIndex()
+    
+    # Latest updated_at of any appointment or series, overall and per owner (feed caching)
+    _last_modified: Optional[datetime] = None
+    _last_modified_by_owner: Dict[str, datetime] = {}
+    
+    # Statuses that free their time slot
+    NON_BLOCKING_STATUSES = {AppointmentStatus.CANCELLED, AppointmentStatus.NO_SHOW}
+    
+    # Occurrences of a series are addressed as "<series id>@<UTC start>"
+    OCCURRENCE_ID_FORMAT = "%Y%m%dT%H%M%SZ"
+    
     @classmethod
     async def get_user_appointments(
         cls,
@@ -24,28 +81,42 @@ class AppointmentService:
         status: Optional[AppointmentStatus] = None,
         pet_id: Optional[str] = None
     ) -> AppointmentsResponse:
-        """Get user's appointments with filtering and pagination"""
-        # Filter appointments by owner
-        user_appointments = [a for a in cls._appointments.values() if a.owner_id == user_id]
-        
-        # Apply status filter
-        if status:
-            user_appointments = [a for a in user_appointments if a.status == status]
+        """
+        Get user's appointments with filtering and pagination
         
-        # Apply pet filter
+        Reads the owner's (or, with pet_id, the pet's) date-sorted index
+        backwards, so the cost depends on the owner's own appointments only.
+        """
+        # Appointments by owner, or by pet for the pet filter
         if pet_id:
-            user_appointments = [a for a in user_appointments if a.pet_id == pet_id]
+            entries = cls._appointments_by_pet.get(pet_id, [])
+        else:
+            entries = cls._appointments_by_owner.get(user_id, [])
         
-        # Sort by appointment date (newest first)
-        user_appointments.sort(key=lambda a: a.appointment_date_time, reverse=True)
-        
-        # Pagination
-        total = len(user_appointments)
-        total_pages = (total + limit - 1) // limit
         start_idx = (page - 1) * limit
         end_idx = start_idx + limit
         
-        paginated_appointments = user_appointments[start_idx:end_idx]
+        # Newest first, merged with the owner's recurring occurrences
+        occurrences = cls._expand_series(cls._series_by_owner.get(user_id, ()))
+        appointments = heapq.merge(
+            (cls._appointments[appointment_id] for _, appointment_id in reversed(entries)),
+            reversed(occurrences),
+            key=cls._sort_key,
+            reverse=True
+        )
+        if status or pet_id:
+            user_appointments = [
+                a for a in appointments
+                if a.owner_id == user_id and (not status or a.status == status) and (not pet_id or a.pet_id == pet_id)
+            ]
+            total = len(user_appointments)
+            paginated_appointments = user_appointments[start_idx:end_idx]
+        else:
+            total = len(entries) + len(occurrences)
+            paginated_appointments = list(islice(appointments, start_idx, end_idx))
+        
+        # Pagination
+        total_pages = (total + limit - 1) // limit
         
         pagination = AppointmentPagination(
             page=page,
@@ -55,7 +126,7 @@ class AppointmentService:
         )
         
         return AppointmentsResponse(
-            appointments=paginated_appointments,
+            appointments=await cls._with_pets(paginated_appointments),
             pagination=pagination
         )
     
@@ -72,9 +143,9 @@ class AppointmentService:
         
         # Parse appointment datetime
         try:
-            appointment_dt = datetime.fromisoformat(
+            appointment_dt = cls._to_utc(datetime.fromisoformat(
                 appointment_input.appointment_date_time.replace('Z', '+00:00')
-            )
+            ))
         except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -82,25 +153,49 @@ class AppointmentService:
             )
         
         
-        # Check for time slot availability (simplified)
-        overlapping = cls._check_time_slot_available(appointment_dt, appointment_input.duration)
-        if overlapping:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="This time slot is already booked. Please choose another time."
-            )
+        # Check for time slot availability and pick a vet and room
+        vet_id, room_id = cls._assign_resources(
+            [appointment_dt],
+            appointment_input.duration,
+            appointment_input.vet_id,
+            appointment_input.room_id
+        )
         
-        appointment_id = f"appt_{uuid.uuid4().hex[:8]}"
         now = datetime.utcnow()
+        appointment = cls._new_appointment(
+            appointment_input, pet, user_id, owner_name, appointment_dt, vet_id, room_id, now
+        )
         
-        appointment = Appointment(
-            id=appointment_id,
+        cls._appointments[appointment.id] = appointment
+        cls._add_to_time_indexes(appointment)
+        cls._index_schedule(appointment)
+        cls._search_index.add(appointment.id, (owner_name, pet.name))
+        cls._touch(appointment.owner_id, now)
+        return (await cls._with_pets([appointment]))[0]
+    
+    @classmethod
+    def _new_appointment(
+        cls,
+        appointment_input: BookAppointmentInput,
+        pet: Pet,
+        owner_id: str,
+        owner_name: str,
+        appointment_dt: datetime,
+        vet_id: str,
+        room_id: str,
+        now: datetime
+    ) -> Appointment:
+        """Build a scheduled appointment (not yet stored or indexed)"""
+        return Appointment(
+            id=f"appt_{uuid.uuid4().hex[:8]}",
             pet_id=pet.id,
-            pet=pet,
-            owner_id=user_id,
+            pet_summary=cls._pet_summary(pet),
+            owner_id=owner_id,
             owner_name=owner_name,
             appointment_date_time=appointment_dt,
             duration=appointment_input.duration,
+            vet_id=vet_id,
+            room_id=room_id,
             status=AppointmentStatus.SCHEDULED,
             appointment_type=appointment_input.appointment_type,
             reason=appointment_input.reason,
@@ -108,28 +203,824 @@ class AppointmentService:
             created_at=now,
             updated_at=now
         )
+    
+    @classmethod
+    async def bulk_book_appointments(
+        cls,
+        appointment_inputs: List[BulkBookAppointmentInput]
+    ) -> BulkBookAppointmentsResponse:
+        """
+        Book many appointments in one pass (e.g. a vaccination drive)
         
-        cls._appointments[appointment_id] = appointment
-        return appointment
+        Requests are swept in start-time order against the resource interval
+        indexes. Each accepted booking is indexed before the next request is
+        checked, so requests in the same batch conflict with each other just
+        as separate bookings would, and the earlier start wins. The accepted
+        bookings are then stored together, with one feed timestamp update per
+        owner and one batched pet lookup for the response. Rejected requests
+        do not block the rest of the batch.
+        
+        Args:
+            appointment_inputs: Bookings to make, each with its pet owner's name
+        
+        Returns:
+            BulkBookAppointmentsResponse with one result per request, in request order
+        """
+        pets = await PetService.get_pets_by_ids({item.pet_id for item in appointment_inputs})
+        results: List[Optional[BulkAppointmentResult]] = [None] * len(appointment_inputs)
+        pending: List[Tuple[datetime, int]] = []
+        
+        for index, appointment_input in enumerate(appointment_inputs):
+            if appointment_input.pet_id not in pets:
+                results[index] = BulkAppointmentResult(
+                    index=index,
+                    success=False,
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    error=f"Pet with id '{appointment_input.pet_id}' not found"
+                )
+                continue
+            try:
+                appointment_dt = cls._to_utc(datetime.fromisoformat(
+                    appointment_input.appointment_date_time.replace('Z', '+00:00')
+                ))
+            except ValueError:
+                results[index] = BulkAppointmentResult(
+                    index=index,
+                    success=False,
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    error="Invalid datetime format. Use ISO format (e.g., 2024-01-15T14:30:00Z)"
+                )
+                continue
+            pending.append((appointment_dt, index))
+        pending.sort()
+        
+        # No awaits from here until everything is stored, so the sweep and the
+        # commit can't interleave with other bookings
+        now = datetime.utcnow()
+        booked: List[Tuple[int, Appointment]] = []
+        for appointment_dt, index in pending:
+            appointment_input = appointment_inputs[index]
+            try:
+                vet_id, room_id = cls._assign_resources(
+                    [appointment_dt],
+                    appointment_input.duration,
+                    appointment_input.vet_id,
+                    appointment_input.room_id
+                )
+            except HTTPException as exc:
+                results[index] = BulkAppointmentResult(
+                    index=index, success=False, status_code=exc.status_code, error=exc.detail
+                )
+                continue
+            pet = pets[appointment_input.pet_id]
+            appointment = cls._new_appointment(
+                appointment_input, pet, pet.owner_id, appointment_input.owner_name, appointment_dt, vet_id, room_id, now
+            )
+            cls._index_schedule(appointment)  # later requests in the batch must see this slot
+            booked.append((index, appointment))
+        
+        for _, appointment in booked:
+            cls._appointments[appointment.id] = appointment
+            cls._add_to_time_indexes(appointment)
+            cls._search_index.add(appointment.id, (appointment.owner_name, appointment.pet_summary.name))
+        for owner_id in {appointment.owner_id for _, appointment in booked}:
+            cls._touch(owner_id, now)
+        
+        appointments = await cls._with_pets([appointment for _, appointment in booked])
+        for (index, _), appointment in zip(booked, appointments):
+            results[index] = BulkAppointmentResult(index=index, success=True, appointment=appointment)
+        
+        return BulkBookAppointmentsResponse(
+            success=len(booked) == len(results),
+            succeeded=len(booked),
+            failed=len(results) - len(booked),
+            results=results
+        )
+    
+    @staticmethod
+    def _pet_summary(pet: Pet) -> PetSummary:
+        return PetSummary(name=pet.name, species=pet.species, breed=pet.breed)
+    
+    @classmethod
+    async def _with_pets(cls, items: List[PetLinkedT]) -> List[PetLinkedT]:
+        """
+        Copies of appointments (or series) with the current pet attached
+        
+        Stored appointments only keep pet_id and a summary; the full pets
+        are fetched from PetService in one batched lookup per response.
+        """
+        pets = await PetService.get_pets_by_ids({item.pet_id for item in items})
+        return [item.model_copy(update={"pet": pets.get(item.pet_id)}) for item in items]
+    
+    @classmethod
+    def reindex_pet(cls, pet: Pet) -> None:
+        """
+        Refresh the pet summary and search entries of one pet's appointments and series
+        
+        Called by PetService when a pet changes; only that pet's documents
+        are touched.
+        """
+        summary = cls._pet_summary(pet)
+        now = datetime.utcnow()
+        for _, appointment_id in cls._appointments_by_pet.get(pet.id, []):
+            appointment = cls._appointments[appointment_id]
+            appointment.pet_summary = summary
+            cls._search_index.add(appointment_id, (appointment.owner_name, pet.name))
+            cls._touch(appointment.owner_id, now)
+        for series_id in cls._series_by_pet.get(pet.id, ()):
+            series = cls._series[series_id]
+            series.pet_summary = summary
+            cls._search_index.add(series_id, (series.owner_name, pet.name))
+            cls._touch(series.owner_id, now)
     
     @classmethod
-    def _check_time_slot_available(cls, requested_time: datetime, duration: int) -> bool:
-        """Check if time slot is available (simplified version)"""
-        from datetime import timedelta
+    def _touch(cls, owner_id: str, updated_at: datetime) -> None:
+        """Record a change for the Last-Modified of the vet and owner feeds"""
+        if cls._last_modified is None or updated_at > cls._last_modified:
+            cls._last_modified = updated_at
+        if owner_id not in cls._last_modified_by_owner or updated_at > cls._last_modified_by_owner[owner_id]:
+            cls._last_modified_by_owner[owner_id] = updated_at
+    
+    @classmethod
+    def get_last_modified(cls, owner_id: Optional[str] = None) -> Optional[datetime]:
+        """Latest updated_at of all appointments and series (or one owner's), None if there are none"""
+        if owner_id is None:
+            return cls._last_modified
+        return cls._last_modified_by_owner.get(owner_id)
+    
+    @classmethod
+    def _add_to_time_indexes(cls, appointment: Appointment) -> None:
+        """File an appointment under its calendar day, owner and pet"""
+        entry = (appointment.appointment_date_time, appointment.id)
+        day = entry[0].date()
+        if day not in cls._appointments_by_day:
+            insort(cls._appointment_days, day)
+        insort(cls._appointments_by_day.setdefault(day, []), entry)
+        insort(cls._appointments_by_owner.setdefault(appointment.owner_id, []), entry)
+        insort(cls._appointments_by_pet.setdefault(appointment.pet_id, []), entry)
+    
+    @classmethod
+    def _remove_from_time_indexes(cls, appointment: Appointment) -> None:
+        """Take an appointment out of its day, owner and pet indexes (call before changing its time)"""
+        entry = (appointment.appointment_date_time, appointment.id)
+        day = entry[0].date()
+        for index, key in (
+            (cls._appointments_by_day, day),
+            (cls._appointments_by_owner, appointment.owner_id),
+            (cls._appointments_by_pet, appointment.pet_id)
+        ):
+            entries = index[key]
+            del entries[bisect_left(entries, entry)]
+            if not entries:
+                del index[key]
+        if day not in cls._appointments_by_day:
+            del cls._appointment_days[bisect_left(cls._appointment_days, day)]
+    
+    @classmethod
+    def _iter_day_buckets(
+        cls,
+        first_day: Optional[date] = None,
+        last_day: Optional[date] = None
+    ) -> Iterator[List[Tuple[datetime, str]]]:
+        """Yield the day buckets between two days (inclusive, open-ended if None), in date order"""
+        lo = bisect_left(cls._appointment_days, first_day) if first_day else 0
+        hi = bisect_right(cls._appointment_days, last_day) if last_day else len(cls._appointment_days)
+        for day in cls._appointment_days[lo:hi]:
+            # A day can empty out while a feed is still streaming
+            yield cls._appointments_by_day.get(day, [])
+    
+    @classmethod
+    async def book_appointment_series(
+        cls,
+        series_input: BookAppointmentSeriesInput,
+        user_id: str,
+        owner_name: str = "User"  # Get from user profile in production
+    ) -> AppointmentSeries:
+        """
+        Book a recurring appointment series
+        
+        The series keeps one vet and room for all occurrences; every
+        occurrence must be free for them. Only the rule is stored.
+        
+        Raises:
+            HTTPException: 400 for an invalid or unbounded rule, 409 if no vet/room is free for every occurrence
+        """
+        pet = await PetService.get_pet_by_id_or_404(series_input.pet_id, user_id)
+        
+        try:
+            first_dt = cls._to_utc(datetime.fromisoformat(
+                series_input.appointment_date_time.replace('Z', '+00:00')
+            ))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid datetime format. Use ISO format (e.g., 2024-01-15T14:30:00Z)"
+            )
+        
+        rule = series_input.recurrence
+        if rule.count is None and rule.until is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Recurrence needs a count or an until date"
+            )
+        if rule.until is not None:
+            rule = rule.model_copy(update={"until": cls._to_utc(rule.until)})
+        
+        max_occurrences = config.APPOINTMENT_SERIES_MAX_OCCURRENCES
+        starts = list(islice(
+            iter_occurrences(first_dt, rule.frequency, rule.interval, rule.count, rule.until),
+            max_occurrences + 1
+        ))
+        if not starts or len(starts) > max_occurrences:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"A series must have between 1 and {max_occurrences} occurrences"
+            )
         
-        requested_end = requested_time + timedelta(minutes=duration)
+        vet_id, room_id = cls._assign_resources(
+            starts,
+            series_input.duration,
+            series_input.vet_id,
+            series_input.room_id
+        )
+        
+        now = datetime.utcnow()
+        series = AppointmentSeries(
+            id=f"ser_{uuid.uuid4().hex[:8]}",
+            pet_id=pet.id,
+            pet_summary=cls._pet_summary(pet),
+            owner_id=user_id,
+            owner_name=owner_name,
+            first_date_time=first_dt,
+            duration=series_input.duration,
+            vet_id=vet_id,
+            room_id=room_id,
+            status=AppointmentStatus.SCHEDULED,
+            appointment_type=series_input.appointment_type,
+            reason=series_input.reason,
+            notes=series_input.notes,
+            recurrence=rule,
+            created_at=now,
+            updated_at=now
+        )
+        
+        cls._series[series.id] = series
+        cls._series_by_pet.setdefault(series.pet_id, set()).add(series.id)
+        cls._index_series(series)
+        cls._search_index.add(series.id, (owner_name, pet.name))
+        cls._touch(series.owner_id, now)
+        return (await cls._with_pets([series]))[0]
+    
+    @staticmethod
+    def _series_span(series: AppointmentSeries) -> Tuple[datetime, Optional[datetime]]:
+        """From the first occurrence start to the last occurrence end (None if the rule never ends)"""
+        rule = series.recurrence
+        if rule.count is None and rule.until is None:
+            return series.first_date_time, None
+        last = deque(
+            iter_occurrences(series.first_date_time, rule.frequency, rule.interval, rule.count, rule.until),
+            maxlen=1
+        )
+        last_start = last[0] if last else series.first_date_time
+        return series.first_date_time, last_start + timedelta(minutes=series.duration)
+    
+    @classmethod
+    def _index_series(cls, series: AppointmentSeries) -> None:
+        """
+        Register an active series with its resources and owner
         
-        for appt in cls._appointments.values():
-            if appt.status in [AppointmentStatus.CANCELLED, AppointmentStatus.NO_SHOW]:
+        Series are indexed by their span, so queries skip series that ended
+        before the window instead of expanding every series ever booked.
+        """
+        start, end = cls._series_span(series)
+        cls._series_spans.add(series.id, start, end)
+        for resource_id in (series.vet_id, series.room_id):
+            if resource_id not in cls._series_by_resource:
+                cls._series_by_resource[resource_id] = SpanIndex(cls._series_spans.open_end)
+            cls._series_by_resource[resource_id].add(series.id, start, end)
+        cls._series_by_owner.setdefault(series.owner_id, set()).add(series.id)
+    
+    @classmethod
+    def _unindex_series(cls, series: AppointmentSeries) -> None:
+        """Release the resources held by a series (it stays listed for its owner)"""
+        for resource_id in (series.vet_id, series.room_id):
+            index = cls._series_by_resource.get(resource_id)
+            if index is not None:
+                index.remove(series.id)
+    
+    @classmethod
+    async def get_series_or_404(cls, series_id: str, user_id: str) -> AppointmentSeries:
+        """Get a series owned by the user or raise 404/403"""
+        series = cls._series.get(series_id)
+        if not series:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Appointment series with id '{series_id}' not found"
+            )
+        if series.owner_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to access this appointment series"
+            )
+        return series
+    
+    @classmethod
+    async def get_series(cls, series_id: str, user_id: str) -> AppointmentSeries:
+        """Get a series owned by the user, with its pet"""
+        return (await cls._with_pets([await cls.get_series_or_404(series_id, user_id)]))[0]
+    
+    @classmethod
+    async def cancel_appointment_series(cls, series_id: str, user_id: str) -> AppointmentSeries:
+        """
+        Cancel a series and all of its occurrences
+        
+        Occurrences that were edited separately are cancelled too, unless
+        they are already in progress, completed or otherwise closed.
+        """
+        series = await cls.get_series_or_404(series_id, user_id)
+        if AppointmentStatus(series.status) == AppointmentStatus.CANCELLED:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Appointment series is already cancelled"
+            )
+        
+        now = datetime.utcnow()
+        series.status = AppointmentStatus.CANCELLED
+        series.updated_at = now
+        cls._unindex_series(series)
+        for _, appointment_id in cls._appointments_by_pet.get(series.pet_id, []):
+            appointment = cls._appointments[appointment_id]
+            if appointment.series_id == series.id and AppointmentStatus(appointment.status) in (
+                AppointmentStatus.SCHEDULED, AppointmentStatus.CONFIRMED
+            ):
+                appointment.status = AppointmentStatus.CANCELLED
+                appointment.updated_at = now
+                cls._index_schedule(appointment)
+        cls._touch(series.owner_id, now)
+        return (await cls._with_pets([series]))[0]
+    
+    @classmethod
+    def _iter_series_starts(
+        cls,
+        series: AppointmentSeries,
+        window_start: Optional[datetime] = None,
+        window_end: Optional[datetime] = None
+    ) -> Iterator[datetime]:
+        """Occurrence starts of a series within [window_start, window_end), skipping detached ones"""
+        rule = series.recurrence
+        for start in iter_occurrences(
+            series.first_date_time, rule.frequency, rule.interval, rule.count, rule.until,
+            window_start, window_end
+        ):
+            if start not in series.exceptions:
+                yield start
+    
+    @classmethod
+    def _occurrence(cls, series: AppointmentSeries, start: datetime) -> Appointment:
+        """Materialize one occurrence of a series as an Appointment"""
+        return Appointment(
+            id=f"{series.id}@{start.strftime(cls.OCCURRENCE_ID_FORMAT)}",
+            pet_id=series.pet_id,
+            pet_summary=series.pet_summary,
+            owner_id=series.owner_id,
+            owner_name=series.owner_name,
+            appointment_date_time=start,
+            duration=series.duration,
+            vet_id=series.vet_id,
+            room_id=series.room_id,
+            series_id=series.id,
+            status=series.status,
+            appointment_type=series.appointment_type,
+            reason=series.reason,
+            notes=series.notes,
+            created_at=series.created_at,
+            updated_at=series.updated_at
+        )
+    
+    @classmethod
+    def _get_occurrence(cls, appointment_id: str) -> Optional[Appointment]:
+        """Resolve a "<series id>@<start>" occurrence id"""
+        series_id, _, stamp = appointment_id.partition("@")
+        series = cls._series.get(series_id)
+        if series is None or not stamp:
+            return None
+        try:
+            start = datetime.strptime(stamp, cls.OCCURRENCE_ID_FORMAT).replace(tzinfo=timezone.utc)
+        except ValueError:
+            return None
+        if next(cls._iter_series_starts(series, start, start + timedelta(seconds=1)), None) != start:
+            return None
+        return cls._occurrence(series, start)
+    
+    @classmethod
+    def _detach_occurrence(cls, occurrence: Appointment) -> Appointment:
+        """
+        Store an occurrence as an appointment of its own, before it is edited
+        
+        Its start becomes an exception of the series, so the rule no longer
+        generates it, and the stored copy keeps the occurrence id and
+        series_id. From then on it is listed, indexed and updated like any
+        one-off appointment (cancelled occurrences included).
+        """
+        series = cls._series[occurrence.series_id]
+        series.exceptions.append(occurrence.appointment_date_time)
+        series.updated_at = datetime.utcnow()
+        
+        cls._appointments[occurrence.id] = occurrence
+        cls._add_to_time_indexes(occurrence)
+        cls._index_schedule(occurrence)
+        cls._search_index.add(occurrence.id, (occurrence.owner_name, occurrence.pet_summary.name))
+        cls._touch(series.owner_id, series.updated_at)
+        return occurrence
+    
+    @classmethod
+    def _expand_series(
+        cls,
+        series_ids: Iterable[str],
+        window_start: Optional[datetime] = None,
+        window_end: Optional[datetime] = None
+    ) -> List[Appointment]:
+        """Occurrences of series (cancelled ones included) starting in [window_start, window_end), sorted by start"""
+        occurrences = [
+            cls._occurrence(series, start)
+            for series in (cls._series[series_id] for series_id in series_ids)
+            for start in cls._iter_series_starts(series, window_start, window_end)
+        ]
+        occurrences.sort(key=cls._sort_key)
+        return occurrences
+    
+    @staticmethod
+    def _sort_key(appointment: Appointment) -> Tuple[datetime, str]:
+        return appointment.appointment_date_time, appointment.id
+    
+    @classmethod
+    def _iter_busy(
+        cls,
+        resource_id: str,
+        start: datetime,
+        end: datetime,
+        exclude_id: Optional[str] = None
+    ) -> Iterator[Tuple[datetime, datetime, str]]:
+        """
+        Booked intervals on a resource overlapping [start, end), ordered by start
+        
+        One-off appointments come from the resource's interval index; each
+        recurring series on the resource is expanded only within the window.
+        """
+        sources = []
+        index = cls._resource_indexes.get(resource_id)
+        if index is not None:
+            sources.append(index.overlapping(start, end, exclude_id))
+        series_index = cls._series_by_resource.get(resource_id)
+        for series_id in series_index.overlapping(start, end) if series_index is not None else ():
+            series = cls._series[series_id]
+            length = timedelta(minutes=series.duration)
+            sources.append(
+                (occurrence, occurrence + length, series_id)
+                for occurrence in cls._iter_series_starts(series, start - length, end)
+                if occurrence + length > start
+            )
+        return heapq.merge(*sources)
+    
+    @classmethod
+    def _is_resource_busy(
+        cls,
+        resource_id: str,
+        start: datetime,
+        end: datetime,
+        exclude_id: Optional[str] = None
+    ) -> bool:
+        return next(cls._iter_busy(resource_id, start, end, exclude_id), None) is not None
+    
+    @staticmethod
+    def _to_utc(value: datetime) -> datetime:
+        """Normalize to an aware UTC datetime (naive values are taken as UTC)"""
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+    
+    @classmethod
+    def _pick_resource(
+        cls,
+        resource_type: ResourceType,
+        slots: List[Tuple[datetime, datetime]],
+        requested_id: Optional[str] = None,
+        preferred_id: Optional[str] = None,
+        exclude_id: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Choose a resource of a type that is free for every slot
+        
+        A requested resource is only used if it is free. Otherwise the
+        preferred resource is kept when free, and failing that the free
+        resource with the fewest minutes booked on the first slot's day is
+        chosen.
+        
+        Args:
+            resource_type: Vet or room
+            slots: (start, end) intervals to cover
+            requested_id: Resource explicitly asked for
+            preferred_id: Resource to keep if possible (on reschedule)
+            exclude_id: Appointment to ignore (the one being rescheduled)
+        
+        Returns:
+            The resource id, or None if no suitable resource is free
+        """
+        if requested_id is not None:
+            ClinicResourceService.get_resource_or_400(requested_id, resource_type)
+            candidates = [requested_id]
+        else:
+            day = slots[0][0].date()
+            candidates = sorted(
+                ClinicResourceService.get_resource_ids(resource_type),
+                key=lambda resource_id: (resource_id != preferred_id, cls._resource_load.get((resource_id, day), 0))
+            )
+        
+        for resource_id in candidates:
+            if not any(cls._is_resource_busy(resource_id, start, end, exclude_id) for start, end in slots):
+                return resource_id
+        return None
+    
+    @classmethod
+    def _assign_resources(
+        cls,
+        starts: List[datetime],
+        duration: int,
+        vet_id: Optional[str] = None,
+        room_id: Optional[str] = None,
+        current: Optional[Appointment] = None
+    ) -> Tuple[str, str]:
+        """
+        Find a vet and room free for every given slot
+        
+        Args:
+            starts: Slot starts (one, or each occurrence of a series)
+            duration: Slot length in minutes
+            vet_id: Vet explicitly asked for, if any
+            room_id: Room explicitly asked for, if any
+            current: Appointment being rescheduled (keeps its vet and room when free)
+        
+        Returns:
+            Tuple of (vet_id, room_id)
+        
+        Raises:
+            HTTPException: 409 if no suitable vet or room is free, 400 if a requested one is unknown
+        """
+        length = timedelta(minutes=duration)
+        slots = [(start, start + length) for start in starts]
+        exclude_id = current.id if current else None
+        assigned = []
+        for resource_type, requested_id, preferred_id in (
+            (ResourceType.VET, vet_id, current.vet_id if current else None),
+            (ResourceType.ROOM, room_id, current.room_id if current else None)
+        ):
+            resource_id = cls._pick_resource(resource_type, slots, requested_id, preferred_id, exclude_id)
+            if resource_id is None:
+                if requested_id is not None:
+                    name = ClinicResourceService.get_resource_or_400(requested_id, resource_type).name
+                    detail = f"{name} is already booked at this time. Please choose another time."
+                else:
+                    detail = "This time slot is already booked. Please choose another time."
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+            assigned.append(resource_id)
+        return assigned[0], assigned[1]
+    
+    @classmethod
+    def _unindex_schedule(cls, appointment_id: str) -> None:
+        """Release the resource slots held by an appointment"""
+        entry = cls._indexed_resources.pop(appointment_id, None)
+        if entry is None:
+            return
+        resource_ids, day, minutes = entry
+        for resource_id in resource_ids:
+            cls._resource_indexes[resource_id].remove(appointment_id)
+            load = cls._resource_load[(resource_id, day)] - minutes
+            if load:
+                cls._resource_load[(resource_id, day)] = load
+            else:
+                del cls._resource_load[(resource_id, day)]
+    
+    @classmethod
+    def _index_schedule(cls, appointment: Appointment) -> None:
+        """Keep the resource indexes in sync with an appointment's time, resources and status"""
+        cls._unindex_schedule(appointment.id)
+        if AppointmentStatus(appointment.status) in cls.NON_BLOCKING_STATUSES:
+            return
+        
+        start = appointment.appointment_date_time
+        end = start + timedelta(minutes=appointment.duration)
+        day = start.date()
+        resource_ids = tuple(r for r in (appointment.vet_id, appointment.room_id) if r)
+        for resource_id in resource_ids:
+            index = cls._resource_indexes.get(resource_id)
+            if index is None:
+                index = cls._resource_indexes[resource_id] = IntervalIndex()
+            index.add(appointment.id, start, end)
+            cls._resource_load[(resource_id, day)] = cls._resource_load.get((resource_id, day), 0) + appointment.duration
+        cls._indexed_resources[appointment.id] = (resource_ids, day, appointment.duration)
+    
+    @classmethod
+    def _free_gaps(cls, resource_id: str, opens: datetime, closes: datetime) -> List[Tuple[datetime, datetime]]:
+        """
+        Free gaps of one resource within [opens, closes)
+        
+        Booked intervals (one-off and recurring) come out of _iter_busy
+        sorted by start; sweeping them while tracking the furthest busy end
+        merges overlaps on the fly and leaves the gaps in between.
+        """
+        gaps = []
+        cursor = opens
+        for busy_start, busy_end, _ in cls._iter_busy(resource_id, opens, closes):
+            if busy_start > cursor:
+                gaps.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+        if cursor < closes:
+            gaps.append((cursor, closes))
+        return gaps
+    
+    @classmethod
+    def _start_windows(
+        cls,
+        resource_ids: List[str],
+        opens: datetime,
+        closes: datetime,
+        length: timedelta
+    ) -> List[Tuple[datetime, datetime]]:
+        """Merged [earliest, latest] ranges of start times at which any of the resources is free for `length`"""
+        ranges = sorted(
+            (gap_start, gap_end - length)
+            for resource_id in resource_ids
+            for gap_start, gap_end in cls._free_gaps(resource_id, opens, closes)
+            if gap_end - gap_start >= length
+        )
+        merged: List[Tuple[datetime, datetime]] = []
+        for earliest, latest in ranges:
+            if merged and earliest <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], latest))
+            else:
+                merged.append((earliest, latest))
+        return merged
+    
+    @staticmethod
+    def _intersect_windows(
+        first: List[Tuple[datetime, datetime]],
+        second: List[Tuple[datetime, datetime]]
+    ) -> List[Tuple[datetime, datetime]]:
+        """Intersection of two sorted lists of disjoint closed ranges"""
+        result = []
+        i = j = 0
+        while i < len(first) and j < len(second):
+            earliest = max(first[i][0], second[j][0])
+            latest = min(first[i][1], second[j][1])
+            if earliest <= latest:
+                result.append((earliest, latest))
+            if first[i][1] < second[j][1]:
+                i += 1
+            else:
+                j += 1
+        return result
+    
+    @classmethod
+    def _iter_free_slots(
+        cls,
+        first_day: date,
+        days: int,
+        duration: int,
+        vet_id: Optional[str] = None
+    ) -> Iterator[AvailableSlot]:
+        """
+        Yield slots of `duration` minutes in clinic hours, in time order, for
+        which a vet (the given one, if any) and a room are both free
+        """
+        length = timedelta(minutes=duration)
+        step = timedelta(minutes=config.APPOINTMENT_SLOT_MINUTES)
+        now = datetime.now(timezone.utc)
+        vet_ids = [vet_id] if vet_id else ClinicResourceService.get_resource_ids(ResourceType.VET)
+        room_ids = ClinicResourceService.get_resource_ids(ResourceType.ROOM)
+        
+        for offset in range(days):
+            day = first_day + timedelta(days=offset)
+            if day.weekday() not in config.CLINIC_OPEN_WEEKDAYS:
+                continue
+            midnight = datetime.combine(day, time(0), tzinfo=timezone.utc)
+            opens = midnight + timedelta(hours=config.CLINIC_OPEN_HOUR)
+            closes = midnight + timedelta(hours=config.CLINIC_CLOSE_HOUR)
+            if closes <= now:
                 continue
             
-            appt_end = appt.appointment_date_time + timedelta(minutes=appt.duration)
-            
-            # Check for overlap
-            if (requested_time < appt_end and requested_end > appt.appointment_date_time):
-                return True
+            windows = cls._intersect_windows(
+                cls._start_windows(vet_ids, opens, closes, length),
+                cls._start_windows(room_ids, opens, closes, length)
+            )
+            for earliest, latest in windows:
+                # First grid point at or after the window start (and not in the past)
+                earliest = max(earliest, now)
+                slot_start = opens + -((opens - earliest) // step) * step  # ceiling division
+                while slot_start <= latest:
+                    yield AvailableSlot(start=slot_start, end=slot_start + length)
+                    slot_start += step
+    
+    @classmethod
+    async def get_availability(
+        cls,
+        start_date: date,
+        duration: int = 30,
+        days: int = 1,
+        limit: int = 20,
+        vet_id: Optional[str] = None
+    ) -> AvailabilityResponse:
+        """
+        Find the first free appointment slots
+        
+        Args:
+            start_date: First day to search
+            duration: Slot length in minutes
+            days: Number of days to search (1 for a day, 7 for a week)
+            limit: Maximum number of slots to return
+            vet_id: Only offer slots with this vet
+        
+        Returns:
+            AvailabilityResponse with slots in time order
         
-        return False
+        Raises:
+            HTTPException: 400 if the vet is unknown
+        """
+        if vet_id is not None:
+            ClinicResourceService.get_resource_or_400(vet_id, ResourceType.VET)
+        
+        slots = []
+        has_more = False
+        for slot in cls._iter_free_slots(start_date, days, duration, vet_id):
+            if len(slots) == limit:
+                has_more = True
+                break
+            slots.append(slot)
+        
+        return AvailabilityResponse(
+            start_date=start_date,
+            end_date=start_date + timedelta(days=days - 1),
+            duration=duration,
+            slots=slots,
+            has_more=has_more
+        )
+    
+    @classmethod
+    def iter_appointments(
+        cls,
+        first_day: Optional[date] = None,
+        last_day: Optional[date] = None,
+        owner_id: Optional[str] = None
+    ) -> Iterator[Appointment]:
+        """
+        Yield one-off appointments in time order (recurring series excluded)
+        
+        Reads the day partitions between first_day and last_day (inclusive,
+        open-ended if None), or the owner's index when owner_id is given.
+        Each bucket is copied before iterating, so callers may yield to the
+        event loop between items.
+        """
+        if owner_id is not None:
+            window_start, window_end = cls._day_window(first_day, last_day)
+            entries = cls._appointments_by_owner.get(owner_id, [])
+            lo = bisect_left(entries, (window_start,)) if window_start else 0
+            hi = bisect_left(entries, (window_end,)) if window_end else len(entries)
+            buckets = [entries[lo:hi]]
+        else:
+            buckets = (list(bucket) for bucket in cls._iter_day_buckets(first_day, last_day))
+        for bucket in buckets:
+            for _, appointment_id in bucket:
+                appointment = cls._appointments.get(appointment_id)
+                if appointment is not None:
+                    yield appointment
+    
+    @staticmethod
+    def _day_window(
+        first_day: Optional[date],
+        last_day: Optional[date]
+    ) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """UTC [start, end) datetimes covering whole days first_day..last_day (None stays open-ended)"""
+        return (
+            datetime.combine(first_day, time(0), tzinfo=timezone.utc) if first_day else None,
+            datetime.combine(last_day + timedelta(days=1), time(0), tzinfo=timezone.utc) if last_day else None
+        )
+    
+    @classmethod
+    def get_series_list(
+        cls,
+        first_day: Optional[date] = None,
+        last_day: Optional[date] = None,
+        owner_id: Optional[str] = None
+    ) -> List[AppointmentSeries]:
+        """Series (including cancelled ones) with an occurrence between two days, optionally for one owner"""
+        window_start, window_end = cls._day_window(first_day, last_day)
+        if owner_id is not None:
+            series_ids = cls._series_by_owner.get(owner_id, ())
+        else:
+            series_ids = cls._series_spans.overlapping(window_start, window_end)
+        return [
+            series for series in (cls._series[series_id] for series_id in series_ids)
+            if next(cls._iter_series_starts(series, window_start, window_end), None) is not None
+        ]
     
     @classmethod
     async def get_appointment_by_id_or_404(
@@ -137,8 +1028,8 @@ class AppointmentService:
         appointment_id: str,
         user_id: str
     ) -> Appointment:
-        """Get appointment by ID or raise 404"""
-        appointment = cls._appointments.get(appointment_id)
+        """Get appointment (or recurring occurrence) by ID or raise 404"""
+        appointment = cls._appointments.get(appointment_id) or cls._get_occurrence(appointment_id)
         if not appointment:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -167,14 +1058,19 @@ class AppointmentService:
         if appointment.status in [AppointmentStatus.COMPLETED, AppointmentStatus.CANCELLED]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot cancel appointment with status '{appointment.status.value}'"
+                detail=f"Cannot cancel appointment with status '{AppointmentStatus(appointment.status).value}'"
             )
         
+        # A series occurrence is stored on its own first, then cancelled like a one-off
+        if appointment.id not in cls._appointments:
+            appointment = cls._detach_occurrence(appointment)
         
         appointment.status = AppointmentStatus.CANCELLED
         appointment.updated_at = datetime.utcnow()
+        cls._index_schedule(appointment)
+        cls._touch(appointment.owner_id, appointment.updated_at)
         
-        return appointment
+        return (await cls._with_pets([appointment]))[0]
     
     @classmethod
     async def reschedule_appointment(
@@ -190,14 +1086,19 @@ class AppointmentService:
         if appointment.status in [AppointmentStatus.COMPLETED, AppointmentStatus.CANCELLED]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot reschedule appointment with status '{appointment.status.value}'"
+                detail=f"Cannot reschedule appointment with status '{AppointmentStatus(appointment.status).value}'"
+            )
+        if appointment.series_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Occurrences of a recurring series can't be rescheduled; cancel the occurrence and book a separate appointment"
             )
         
         # Parse new datetime
         try:
-            new_dt = datetime.fromisoformat(
+            new_dt = cls._to_utc(datetime.fromisoformat(
                 reschedule_input.appointment_date_time.replace('Z', '+00:00')
-            )
+            ))
         except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -205,23 +1106,19 @@ class AppointmentService:
             )
         
         
-        # Check availability (excluding current appointment)
-        temp_status = appointment.status
-        appointment.status = AppointmentStatus.CANCELLED  # Temporarily mark as cancelled
-        
-        overlapping = cls._check_time_slot_available(new_dt, appointment.duration)
-        appointment.status = temp_status  # Restore status
-        
-        if overlapping:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="This time slot is already booked"
-            )
+        # Check availability (excluding current appointment), keeping the same vet and room if free
+        vet_id, room_id = cls._assign_resources([new_dt], appointment.duration, current=appointment)
         
+        cls._remove_from_time_indexes(appointment)
         appointment.appointment_date_time = new_dt
+        cls._add_to_time_indexes(appointment)
+        appointment.vet_id = vet_id
+        appointment.room_id = room_id
         appointment.updated_at = datetime.utcnow()
+        cls._index_schedule(appointment)
+        cls._touch(appointment.owner_id, appointment.updated_at)
         
-        return appointment
+        return (await cls._with_pets([appointment]))[0]
 
     @classmethod
     async def get_all_appointments(
@@ -233,26 +1130,21 @@ class AppointmentService:
         start_date: Optional[str] = None,
         end_date: Optional[str] = None
     ) -> AppointmentsResponse:
-        """Get all appointments (for vet view)"""
-        appointments = list(cls._appointments.values())
+        """
+        Get all appointments (for vet view)
         
-        # Apply search filter
-        if search:
-            search_lower = search.lower()
-            appointments = [
-                a for a in appointments
-                if (search_lower in a.owner_name.lower() or
-                    search_lower in a.pet.name.lower())
-            ]
+        Only the day buckets inside the date filters are visited; buckets are
+        presorted and disjoint, so walking them in date order yields
+        appointments already sorted by time. Recurring series are expanded
+        for the same window only and merged in.
+        """
+        first_day: Optional[date] = None
+        last_day: Optional[date] = None
         
         # Apply single date filter
         if date_filter:
             try:
-                filter_date = datetime.fromisoformat(date_filter.replace('Z', '+00:00')).date()
-                appointments = [
-                    a for a in appointments
-                    if a.appointment_date_time.date() == filter_date
-                ]
+                first_day = last_day = datetime.fromisoformat(date_filter.replace('Z', '+00:00')).date()
             except ValueError:
                 pass
         
@@ -261,23 +1153,60 @@ class AppointmentService:
             try:
                 start_dt = datetime.fromisoformat(start_date).date()
                 end_dt = datetime.fromisoformat(end_date).date()
-                appointments = [
-                    a for a in appointments
-                    if start_dt <= a.appointment_date_time.date() <= end_dt
-                ]
+                first_day = max(first_day, start_dt) if first_day else start_dt
+                last_day = min(last_day, end_dt) if last_day else end_dt
             except ValueError:
                 pass
         
-        # Sort by appointment date
-        appointments.sort(key=lambda a: a.appointment_date_time)
-        
-        # Pagination
-        total = len(appointments)
-        total_pages = (total + limit - 1) // limit
+        window_start, window_end = cls._day_window(first_day, last_day)
+        buckets = list(cls._iter_day_buckets(first_day, last_day))
         start_idx = (page - 1) * limit
         end_idx = start_idx + limit
         
-        paginated = appointments[start_idx:end_idx]
+        # Search candidates from the name index (None if the query is too short to use it)
+        candidates = cls._search_index.candidates(search) if search else None
+        
+        if candidates is not None and len(candidates) < sum(len(bucket) for bucket in buckets):
+            # Fewer matches than appointments in the window: start from the matches
+            one_offs = sorted(
+                (
+                    a for a in (cls._appointments.get(doc_id) for doc_id in candidates)
+                    if a is not None
+                    and (window_start is None or a.appointment_date_time >= window_start)
+                    and (window_end is None or a.appointment_date_time < window_end)
+                ),
+                key=cls._sort_key
+            )
+            occurrences = cls._expand_series(
+                [doc_id for doc_id in candidates if doc_id in cls._series],
+                window_start,
+                window_end
+            )
+        else:
+            one_offs = (cls._appointments[appointment_id] for bucket in buckets for _, appointment_id in bucket)
+            occurrences = cls._expand_series(
+                cls._series_spans.overlapping(window_start, window_end),
+                window_start,
+                window_end
+            )
+        appointments = heapq.merge(one_offs, occurrences, key=cls._sort_key)
+        
+        # Apply search filter (verifies index candidates, or scans for short queries)
+        if search:
+            search_lower = search.lower()
+            appointments = [
+                a for a in appointments
+                if (search_lower in a.owner_name.lower() or
+                    search_lower in a.pet_summary.name.lower())
+            ]
+            total = len(appointments)
+            paginated = appointments[start_idx:end_idx]
+        else:
+            total = sum(len(bucket) for bucket in buckets) + len(occurrences)
+            paginated = list(islice(appointments, start_idx, end_idx))
+        
+        # Pagination
+        total_pages = (total + limit - 1) // limit
         
         pagination = AppointmentPagination(
             page=page,
@@ -287,36 +1216,64 @@ class AppointmentService:
         )
         
         return AppointmentsResponse(
-            appointments=paginated,
+            appointments=await cls._with_pets(paginated),
             pagination=pagination
         )
 
     @classmethod
     async def get_appointment_by_id(cls, appointment_id: str) -> Optional[Appointment]:
-        """Get appointment by ID (no ownership check for vet)"""
-        return cls._appointments.get(appointment_id)
+        """Get appointment or recurring occurrence by ID (no ownership check for vet)"""
+        appointment = cls._appointments.get(appointment_id) or cls._get_occurrence(appointment_id)
+        if appointment is None:
+            return None
+        return (await cls._with_pets([appointment]))[0]
 
     @classmethod
     async def update_appointment_status(
         cls,
         appointment_id: str,
-        status: AppointmentStatus,
+        new_status: AppointmentStatus,
         diagnosis: Optional[str] = None,
         treatment: Optional[str] = None
     ) -> Appointment:
-        """Update appointment status and medical info (vet only)"""
+        """
+        Update appointment status and medical info (vet only)
+        
+        A recurring occurrence is stored as its own appointment on its first
+        update, so its status, diagnosis and treatment don't touch the series.
+        
+        Raises:
+            HTTPException: 404 if not found, 409 if reopening a cancelled or
+                no-show appointment whose vet or room has been booked since
+        """
         appointment = cls._appointments.get(appointment_id)
-        if not appointment:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Appointment with id '{appointment_id}' not found"
+        if appointment is None:
+            occurrence = cls._get_occurrence(appointment_id)
+            if occurrence is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Appointment with id '{appointment_id}' not found"
+                )
+            appointment = cls._detach_occurrence(occurrence)
+        
+        # Leaving a cancelled/no-show status takes the slot back; it may have been booked since
+        if (AppointmentStatus(appointment.status) in cls.NON_BLOCKING_STATUSES
+                and AppointmentStatus(new_status) not in cls.NON_BLOCKING_STATUSES):
+            appointment.vet_id, appointment.room_id = cls._assign_resources(
+                [appointment.appointment_date_time],
+                appointment.duration,
+                appointment.vet_id,
+                appointment.room_id,
+                current=appointment
             )
         
-        appointment.status = status
+        appointment.status = new_status
         if diagnosis is not None:
             appointment.diagnosis = diagnosis
         if treatment is not None:
             appointment.treatment = treatment
         appointment.updated_at = datetime.utcnow()
+        cls._index_schedule(appointment)
+        cls._touch(appointment.owner_id, appointment.updated_at)
         
-        return appointment
\ No newline at end of file
+        return (await cls._with_pets([appointment]))[0]
@@ -2,6 +2,7 @@ from datetime import datetime
 from fastapi import HTTPException, status
 from app.models.cart import Cart, CartItem, AddToCartRequest, UpdateCartItemRequest
 from app.services.product_service import ProductService
+from app.services.shipping_rate_service import ShippingRateService
 import uuid
 
 
@@ -11,10 +12,13 @@ class CartService:
     # In-memory storage (replace with database in production)
     _carts = {}
     
+    # Cart id -> version, bumped whenever items, quantities or prices change
+    _cart_versions = {}
+    _cart_signatures = {}
+    
     # Configuration
     TAX_RATE = 0.08  # 8% tax
-    SHIPPING_THRESHOLD = 50.0  # Free shipping over \$50
-    SHIPPING_COST = 5.99
+    SHIPPING_THRESHOLD = ShippingRateService.FREE_SHIPPING_THRESHOLD
     
     @classmethod
     def _calculate_cart_totals(cls, cart: Cart) -> Cart:
@@ -31,12 +35,18 @@ class CartService:
         # Calculate tax
         cart.tax = round(cart.subtotal * cls.TAX_RATE, 2)
         
-        # Calculate shipping
-        cart.shipping = 0.0 if cart.subtotal >= cls.SHIPPING_THRESHOLD else cls.SHIPPING_COST
+        # Estimate shipping with the same engine that prices the order
+        cart.shipping = ShippingRateService.estimate_rate(cart.total_items, cart.subtotal).cost
         
         # Calculate total
         cart.total = round(cart.subtotal + cart.tax + cart.shipping, 2)
         
+        # Bump the version only if the contents actually changed
+        signature = tuple((item.id, item.quantity, item.product.price) for item in cart.items)
+        if cls._cart_signatures.get(cart.id) != signature:
+            cls._cart_signatures[cart.id] = signature
+            cls._cart_versions[cart.id] = cls._cart_versions.get(cart.id, 0) + 1
+        
         # Update timestamp
         cart.updated_at = datetime.utcnow()
         
@@ -59,6 +69,12 @@ class CartService:
         
         return cls._carts[user_id]
     
+    @classmethod
+    def get_cart_version(cls, user_id: str = "default") -> int:
+        """Current version of a user's cart (0 if the cart was never modified)"""
+        cart = cls._carts.get(user_id)
+        return cls._cart_versions.get(cart.id, 0) if cart else 0
+    
     @classmethod
     async def add_item_to_cart(
         cls, 
@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 from fastapi import HTTPException, status
 import re
 
@@ -9,41 +9,37 @@ from app.models.order import (
     ShippingValidationResponse,
     ShippingCalculationResponse,
     OrderSummary,
-    ShippingMethod
+    ShippingMethod,
+    BatchCardValidationResponse,
+    CardValidationResult,
+    OrderPagination,
+    UserPaymentMethods,
+    AdminPaymentMethodsResponse
 )
+from app.core.card_validation import (
+    detect_card_brand,
+    is_valid_card_number,
+    normalize_card_number,
+    validate_card_numbers
+)
+from app.services.cart_service import CartService
+from app.services.shipping_rate_service import ShippingRateService
 
 
 class CheckoutService:
     """Service layer for checkout operations"""
     
-    # Mock payment methods database (per user)
-    _payment_methods: Dict[str, List[PaymentMethodResponse]] = {}
-    
-    # Shipping rates
-    SHIPPING_RATES = {
-        "standard": {
-            "name": "Standard Shipping",
-            "base_cost": 0.0,
-            "days": 5
-        },
-        "express": {
-            "name": "Express Shipping",
-            "base_cost": 15.99,
-            "days": 2
-        },
-        "overnight": {
-            "name": "Overnight Shipping",
-            "base_cost": 29.99,
-            "days": 1
-        }
-    }
+    # Mock payment methods database: user -> {payment method id -> method}
+    _payment_methods: Dict[str, Dict[str, PaymentMethodResponse]] = {}
+    # user -> id of their default payment method
+    _default_payment_methods: Dict[str, str] = {}
     
     @classmethod
     def initialize_mock_data(cls, user_id: str = "default"):
         """Initialize mock payment methods"""
         if user_id not in cls._payment_methods:
-            cls._payment_methods[user_id] = [
-                PaymentMethodResponse(
+            cls._payment_methods[user_id] = {
+                "pm_default": PaymentMethodResponse(
                     id="pm_default",
                     type="card",
                     is_default=True,
@@ -53,7 +49,27 @@ class CheckoutService:
                     expiry_year="2025",
                     cardholder_name="John Doe"
                 )
-            ]
+            }
+            cls._default_payment_methods[user_id] = "pm_default"
+    
+    @classmethod
+    def _get_user_payment_methods(cls, user_id: str) -> Dict[str, PaymentMethodResponse]:
+        """Get a user's payment methods by id, seeding mock data for new users"""
+        methods = cls._payment_methods.get(user_id)
+        if methods is None:
+            cls.initialize_mock_data(user_id)
+            methods = cls._payment_methods[user_id]
+        return methods
+    
+    @classmethod
+    def _set_default_payment_method(cls, user_id: str, method: PaymentMethodResponse) -> None:
+        """Make a method the user's default, clearing the flag on the previous one"""
+        methods = cls._payment_methods[user_id]
+        previous_id = cls._default_payment_methods.get(user_id)
+        if previous_id and previous_id != method.id and previous_id in methods:
+            methods[previous_id].is_default = False
+        method.is_default = True
+        cls._default_payment_methods[user_id] = method.id
     
     @classmethod
     async def validate_shipping_address(
@@ -96,9 +112,16 @@ class CheckoutService:
     async def calculate_shipping(
         cls,
         address: ShippingAddressInput,
-        subtotal: float = 0.0
+        subtotal: Optional[float] = None,
+        item_count: Optional[int] = None,
+        user_id: str = "default"
     ) -> ShippingCalculationResponse:
-        """Calculate shipping costs based on address and cart subtotal"""
+        """
+        Calculate shipping costs based on address, cart size and cart subtotal
+        
+        A subtotal or item count left out is taken from the user's cart, so
+        the quote matches what the order will be charged.
+        """
         # Validate address first
         validation = await cls.validate_shipping_address(address)
         if not validation.valid:
@@ -107,25 +130,12 @@ class CheckoutService:
                 detail=f"Invalid shipping address: {validation.message}"
             )
         
-        from app.services.cart_service import CartService
-        
-        # Build shipping methods list
-        shipping_methods = []
+        if subtotal is None or item_count is None:
+            cart = await CartService.get_or_create_cart(user_id)
+            subtotal = cart.subtotal if subtotal is None else subtotal
+            item_count = cart.total_items if item_count is None else item_count
         
-        for method_id, config in cls.SHIPPING_RATES.items():
-            cost = config["base_cost"]
-            
-            # Apply free shipping for standard if over threshold
-            if method_id == "standard" and subtotal >= CartService.SHIPPING_THRESHOLD:
-                cost = 0.0
-            
-            shipping_method = ShippingMethod(
-                id=method_id,
-                name=config["name"],
-                cost=cost,
-                estimated_days=config["days"]
-            )
-            shipping_methods.append(shipping_method)
+        shipping_methods = ShippingRateService.get_shipping_methods(address.zip_code, item_count, subtotal)
         
         # Default to first method (standard)
         default_method = shipping_methods[0]
@@ -152,8 +162,7 @@ class CheckoutService:
         Returns:
             List of saved payment methods
         """
-        cls.initialize_mock_data(user_id)
-        return cls._payment_methods.get(user_id, [])
+        return list(cls._get_user_payment_methods(user_id).values())
     
     @classmethod
     async def add_payment_method(
@@ -206,7 +215,7 @@ class CheckoutService:
             new_method = PaymentMethodResponse(
                 id=pm_id,
                 type="card",
-                is_default=payment_method.is_default,
+                is_default=False,
                 last4=last4,
                 brand=brand,
                 expiry_month=payment_method.expiry_month,
@@ -214,29 +223,69 @@ class CheckoutService:
                 cardholder_name=payment_method.cardholder_name
             )
             
-            # Initialize if needed
-            cls.initialize_mock_data(user_id)
+            # Add to user's payment methods
+            cls._get_user_payment_methods(user_id)[pm_id] = new_method
             
-            # If this is set as default, unset others
+            # If this is set as default, unset the previous default
             if payment_method.is_default:
-                for method in cls._payment_methods[user_id]:
-                    method.is_default = False
-            
-            # Add to user's payment methods
-            cls._payment_methods[user_id].append(new_method)
+                cls._set_default_payment_method(user_id, new_method)
             
             return new_method
         
         # Return existing payment method
-        for method in cls._payment_methods.get(user_id, []):
-            if method.id == payment_method.id:
-                return method
+        method = cls._payment_methods.get(user_id, {}).get(payment_method.id)
+        if method:
+            return method
         
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Payment method with id '{payment_method.id}' not found"
         )
     
+    @classmethod
+    async def list_payment_methods_admin(
+        cls,
+        user_ids: Optional[List[str]] = None,
+        page: int = 1,
+        limit: int = 50
+    ) -> AdminPaymentMethodsResponse:
+        """
+        List saved payment methods for many users at once (admin)
+        
+        Args:
+            user_ids: Users to include (all users with saved methods if omitted)
+            page: Page number over users
+            limit: Users per page
+            
+        Returns:
+            AdminPaymentMethodsResponse with one entry per user
+        """
+        if user_ids is None:
+            user_ids = list(cls._payment_methods.keys())
+        else:
+            user_ids = [user_id for user_id in dict.fromkeys(user_ids) if user_id in cls._payment_methods]
+        
+        total = len(user_ids)
+        start = (page - 1) * limit
+        users = [
+            UserPaymentMethods(
+                user_id=user_id,
+                default_payment_method_id=cls._default_payment_methods.get(user_id),
+                payment_methods=list(cls._payment_methods[user_id].values())
+            )
+            for user_id in user_ids[start:start + limit]
+        ]
+        
+        return AdminPaymentMethodsResponse(
+            users=users,
+            pagination=OrderPagination(
+                page=page,
+                limit=limit,
+                total=total,
+                total_pages=(total + limit - 1) // limit
+            )
+        )
+    
     @classmethod
     def _validate_card_number(cls, card_number: str) -> bool:
         """
@@ -248,26 +297,7 @@ class CheckoutService:
         Returns:
             True if valid, False otherwise
         """
-        # Remove spaces and dashes
-        card_number = re.sub(r'[\s-]', '', card_number)
-        
-        # Check if all digits
-        if not card_number.isdigit():
-            return False
-        
-        # Luhn algorithm
-        def luhn_checksum(card_num):
-            def digits_of(n):
-                return [int(d) for d in str(n)]
-            digits = digits_of(card_num)
-            odd_digits = digits[-1::-2]
-            even_digits = digits[-2::-2]
-            checksum = sum(odd_digits)
-            for d in even_digits:
-                checksum += sum(digits_of(d * 2))
-            return checksum % 10
-        
-        return luhn_checksum(card_number) == 0
+        return is_valid_card_number(card_number)
     
     @classmethod
     def _detect_card_brand(cls, card_number: str) -> str:
@@ -280,20 +310,40 @@ class CheckoutService:
         Returns:
             Card brand name
         """
-        # Remove spaces and dashes
-        card_number = re.sub(r'[\s-]', '', card_number)
+        return detect_card_brand(card_number)
+    
+    @classmethod
+    async def validate_card_numbers(cls, card_numbers: List[str]) -> BatchCardValidationResponse:
+        """
+        Validate and classify card numbers in bulk (card-on-file imports)
         
-        # Card brand patterns
-        if re.match(r'^4', card_number):
-            return "Visa"
-        elif re.match(r'^5[1-5]', card_number):
-            return "Mastercard"
-        elif re.match(r'^3[47]', card_number):
-            return "American Express"
-        elif re.match(r'^6(?:011|5)', card_number):
-            return "Discover"
-        else:
-            return "Unknown"
+        Uses the same Luhn and brand prefix tables as the single-card path,
+        vectorized over all numbers at once.
+        
+        Args:
+            card_numbers: Card numbers (spaces and dashes allowed)
+            
+        Returns:
+            BatchCardValidationResponse with one result per input, in order
+        """
+        valid, brands = validate_card_numbers(card_numbers)
+        results = [
+            CardValidationResult(
+                index=index,
+                valid=is_valid,
+                brand=brand,
+                last4=normalize_card_number(card_number)[-4:]
+            )
+            for index, (card_number, is_valid, brand) in enumerate(zip(card_numbers, valid.tolist(), brands))
+        ]
+        valid_count = int(valid.sum())
+        
+        return BatchCardValidationResponse(
+            success=True,
+            valid_count=valid_count,
+            invalid_count=len(results) - valid_count,
+            results=results
+        )
     
     @classmethod
     async def validate_order_summary(
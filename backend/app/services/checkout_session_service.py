@@ -0,0 +1,158 @@
+from typing import Optional
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from fastapi import HTTPException, status
+import uuid
+
+from app.models.order import (
+    CheckoutSession,
+    CreateCheckoutSessionRequest,
+    OrderSummary,
+    ShippingCalculationResponse
+)
+from app.services.cart_service import CartService
+from app.services.checkout_service import CheckoutService
+from app.services.product_service import ProductService
+from app.services.shipping_rate_service import ShippingRateService
+from app.core import config
+
+
+class CheckoutSessionService:
+    """
+    Service layer for checkout sessions
+    
+    A session memoizes the expensive checkout steps (address validation,
+    shipping quote, refreshed cart totals) together with the cart and product
+    versions they were computed against, so placing the order only has to
+    redo the steps whose inputs changed since.
+    
+    Sessions live in memory with a sliding TTL; the oldest are evicted first.
+    """
+    
+    # Ordered by expiry (every touch moves a session to the end)
+    _sessions: "OrderedDict[str, CheckoutSession]" = OrderedDict()
+    
+    @classmethod
+    def _expire(cls, now: datetime) -> None:
+        """Drop expired sessions from the front of the queue"""
+        while cls._sessions:
+            session = next(iter(cls._sessions.values()))
+            if session.expires_at > now:
+                break
+            cls._sessions.popitem(last=False)
+    
+    @classmethod
+    async def create_session(
+        cls,
+        request: CreateCheckoutSessionRequest,
+        user_id: str = "default"
+    ) -> CheckoutSession:
+        """
+        Validate the address, refresh the cart and quote shipping once
+        
+        Args:
+            request: Shipping address and method
+            user_id: User identifier
+        
+        Returns:
+            New CheckoutSession
+        
+        Raises:
+            HTTPException: 400 if the address is invalid or the cart is empty
+        """
+        validation = await CheckoutService.validate_shipping_address(request.shipping_address)
+        if not validation.valid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid shipping address: {validation.message}"
+            )
+        
+        cart = await CartService.refresh_cart_items(user_id)
+        if not cart.items or cart.total_items == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot start checkout with an empty cart"
+            )
+        
+        zip_code = request.shipping_address.zip_code
+        shipping_methods = ShippingRateService.get_shipping_methods(zip_code, cart.total_items, cart.subtotal)
+        rate = ShippingRateService.get_rate(zip_code, cart.total_items, cart.subtotal, request.shipping_method.lower())
+        
+        now = datetime.utcnow()
+        session = CheckoutSession(
+            id=f"cs_{uuid.uuid4().hex}",
+            user_id=user_id,
+            shipping_address=request.shipping_address,
+            shipping_method=rate.method_id,
+            shipping=ShippingCalculationResponse(
+                success=True,
+                cost=rate.cost,
+                currency="USD",
+                estimated_days=rate.days,
+                shipping_methods=shipping_methods
+            ),
+            order_summary=OrderSummary(
+                subtotal=cart.subtotal,
+                shipping=rate.cost,
+                tax=cart.tax,
+                discount=0.0,
+                total=round(cart.subtotal + rate.cost + cart.tax, 2)
+            ),
+            cart_version=CartService.get_cart_version(user_id),
+            product_versions=ProductService.get_product_versions(item.product.id for item in cart.items),
+            created_at=now,
+            expires_at=now + timedelta(seconds=config.CHECKOUT_SESSION_TTL)
+        )
+        
+        cls._expire(now)
+        cls._sessions[session.id] = session
+        while len(cls._sessions) > config.CHECKOUT_SESSION_MAX:
+            cls._sessions.popitem(last=False)
+        
+        return session
+    
+    @classmethod
+    def get_session(cls, session_id: str, user_id: str = "default") -> Optional[CheckoutSession]:
+        """Get a live session owned by the user, extending its TTL"""
+        now = datetime.utcnow()
+        cls._expire(now)
+        session = cls._sessions.get(session_id)
+        if session is None or session.user_id != user_id:
+            return None
+        session.expires_at = now + timedelta(seconds=config.CHECKOUT_SESSION_TTL)
+        cls._sessions.move_to_end(session_id)
+        return session
+    
+    @classmethod
+    def get_session_or_404(cls, session_id: str, user_id: str = "default") -> CheckoutSession:
+        """
+        Get a live session or raise 404
+        
+        Raises:
+            HTTPException: 404 if the session does not exist or has expired
+        """
+        session = cls.get_session(session_id, user_id)
+        if session is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Checkout session '{session_id}' not found or expired"
+            )
+        return session
+    
+    @classmethod
+    def is_cart_current(cls, session: CheckoutSession) -> bool:
+        """
+        Whether the cart and the products in it are unchanged since the session was built
+        
+        Only the cart's own products are compared, so orders for other
+        products don't invalidate the session.
+        """
+        return (
+            session.cart_version == CartService.get_cart_version(session.user_id)
+            and session.product_versions == ProductService.get_product_versions(session.product_versions)
+        )
+    
+    @classmethod
+    def invalidate(cls, session_id: str) -> None:
+        """Drop a session (e.g. once its order was placed)"""
+        cls._sessions.pop(session_id, None)
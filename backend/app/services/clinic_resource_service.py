@@ -0,0 +1,58 @@
+from typing import Dict, List, Optional
+from fastapi import HTTPException, status
+
+from app.models.appointment import ClinicResource, ResourceType
+
+
+class ClinicResourceService:
+    """Service layer for bookable clinic resources (vets and rooms)"""
+    
+    # Mock resources database
+    _resources: Dict[str, ClinicResource] = {}
+    
+    @classmethod
+    def initialize_mock_data(cls):
+        """Initialize with mock vets and rooms - call this on startup"""
+        cls._resources = {
+            "vet_001": ClinicResource(id="vet_001", name="Dr. Sarah Chen", type=ResourceType.VET),
+            "vet_002": ClinicResource(id="vet_002", name="Dr. Miguel Alvarez", type=ResourceType.VET),
+            "vet_003": ClinicResource(id="vet_003", name="Dr. Priya Nair", type=ResourceType.VET),
+            "vet_004": ClinicResource(id="vet_004", name="Dr. James Okafor", type=ResourceType.VET),
+            "room_001": ClinicResource(id="room_001", name="Exam Room 1", type=ResourceType.ROOM),
+            "room_002": ClinicResource(id="room_002", name="Exam Room 2", type=ResourceType.ROOM),
+            "room_003": ClinicResource(id="room_003", name="Exam Room 3", type=ResourceType.ROOM),
+            "room_004": ClinicResource(id="room_004", name="Surgery Suite", type=ResourceType.ROOM),
+        }
+    
+    @classmethod
+    async def get_resources(cls, resource_type: Optional[ResourceType] = None) -> List[ClinicResource]:
+        """Get all resources, optionally of one type"""
+        if resource_type is None:
+            return list(cls._resources.values())
+        return [r for r in cls._resources.values() if r.type == resource_type]
+    
+    @classmethod
+    def get_resource(cls, resource_id: str) -> Optional[ClinicResource]:
+        """Get a resource by ID"""
+        return cls._resources.get(resource_id)
+    
+    @classmethod
+    def get_resource_ids(cls, resource_type: ResourceType) -> List[str]:
+        """Get the ids of all resources of a type"""
+        return [r.id for r in cls._resources.values() if r.type == resource_type]
+    
+    @classmethod
+    def get_resource_or_400(cls, resource_id: str, resource_type: ResourceType) -> ClinicResource:
+        """
+        Get a resource of the expected type or raise 400
+        
+        Raises:
+            HTTPException: 400 if the id is unknown or names a different kind of resource
+        """
+        resource = cls._resources.get(resource_id)
+        if resource is None or resource.type != resource_type:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown {ResourceType(resource_type).value} '{resource_id}'"
+            )
+        return resource
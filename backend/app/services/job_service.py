@@ -0,0 +1,53 @@
+from typing import Any, Dict
+
+from app.models.job import JobQueueMetrics
+from app.core.job_queue import JobHandler, JobQueue
+from app.core import config
+
+
+class JobService:
+    """Service layer for the background job queue"""
+    
+    _queue = JobQueue(
+        concurrency=config.JOB_CONCURRENCY,
+        max_attempts=config.JOB_MAX_ATTEMPTS,
+        retry_base_delay=config.JOB_RETRY_BASE_DELAY,
+        retry_max_delay=config.JOB_RETRY_MAX_DELAY,
+        claim_lease=config.JOB_CLAIM_LEASE
+    )
+    
+    @classmethod
+    def register(cls, name: str, handler: JobHandler) -> None:
+        """Register the handler for a job name"""
+        cls._queue.register(name, handler)
+    
+    @classmethod
+    def enqueue(cls, name: str, payload: Dict[str, Any], delay: float = 0.0) -> str:
+        """
+        Queue a job to run after the current request
+        
+        Args:
+            name: Job name
+            payload: JSON-serialisable job arguments
+            delay: Seconds to wait before the first run
+            
+        Returns:
+            The job id
+        """
+        return cls._queue.enqueue(name, payload, delay)
+    
+    @classmethod
+    async def start(cls) -> None:
+        """Start the workers, backed by a local SQLite store if persistence is enabled (one process, like the order log)"""
+        db_path = config.DATA_DIR / "jobs.db" if config.PERSISTENCE_ENABLED else None
+        await cls._queue.start(db_path)
+    
+    @classmethod
+    async def stop(cls) -> None:
+        """Drain ready jobs briefly, then stop the workers"""
+        await cls._queue.stop()
+    
+    @classmethod
+    async def get_metrics(cls) -> JobQueueMetrics:
+        """Get queue depth and lag metrics"""
+        return JobQueueMetrics(**cls._queue.metrics())
@@ -0,0 +1,151 @@
+from typing import Dict, List, Optional, Tuple
+from heapq import nlargest
+
+from app.models.order import (
+    OrderDetails,
+    OrderStatusEnum,
+    OrderAnalyticsResponse,
+    DailyRevenue,
+    ProductSales
+)
+
+
+class OrderAnalyticsService:
+    """
+    Service layer for sales analytics
+    
+    Rollups are updated incrementally as orders are created and change status,
+    so reads cost O(buckets) instead of O(orders). Cancelled orders are kept in
+    the status counts but excluded from revenue and product sales.
+    """
+    
+    # Rollups
+    _daily_revenue: Dict[str, float] = {}  # YYYY-MM-DD -> revenue
+    _daily_orders: Dict[str, int] = {}  # YYYY-MM-DD -> order count
+    _status_counts: Dict[str, int] = {}
+    _product_units: Dict[str, int] = {}
+    _product_revenue: Dict[str, float] = {}
+    _product_names: Dict[str, str] = {}
+    
+    @classmethod
+    def _apply_sales(cls, order: OrderDetails, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) an order's sales from the rollups"""
+        day = order.order_date.strftime("%Y-%m-%d")
+        cls._daily_revenue[day] = cls._daily_revenue.get(day, 0.0) + sign * order.total_amount
+        cls._daily_orders[day] = cls._daily_orders.get(day, 0) + sign
+        
+        for item in order.items:
+            cls._product_units[item.product_id] = cls._product_units.get(item.product_id, 0) + sign * item.quantity
+            cls._product_revenue[item.product_id] = cls._product_revenue.get(item.product_id, 0.0) + sign * item.total_price
+            cls._product_names[item.product_id] = item.product_name
+    
+    @classmethod
+    def record_order_created(cls, order: OrderDetails) -> None:
+        """Account for a newly created order"""
+        status_value = OrderStatusEnum(order.status).value
+        cls._status_counts[status_value] = cls._status_counts.get(status_value, 0) + 1
+        
+        if status_value != OrderStatusEnum.CANCELLED.value:
+            cls._apply_sales(order, 1)
+    
+    @classmethod
+    def record_status_change(
+        cls,
+        order: OrderDetails,
+        old_status: OrderStatusEnum,
+        new_status: OrderStatusEnum
+    ) -> None:
+        """Move an order between status buckets, reversing sales on cancellation"""
+        old_value = OrderStatusEnum(old_status).value
+        new_value = OrderStatusEnum(new_status).value
+        if old_value == new_value:
+            return
+        
+        cls._status_counts[old_value] = cls._status_counts.get(old_value, 0) - 1
+        cls._status_counts[new_value] = cls._status_counts.get(new_value, 0) + 1
+        
+        cancelled = OrderStatusEnum.CANCELLED.value
+        if new_value == cancelled:
+            cls._apply_sales(order, -1)
+        elif old_value == cancelled:
+            cls._apply_sales(order, 1)
+    
+    @classmethod
+    def record_status_changes(
+        cls,
+        changes: List[Tuple[OrderDetails, OrderStatusEnum, OrderStatusEnum]]
+    ) -> None:
+        """Apply a batch of (order, old status, new status) moves"""
+        for order, old_status, new_status in changes:
+            cls.record_status_change(order, old_status, new_status)
+    
+    @classmethod
+    def export_state(cls) -> Dict[str, Dict]:
+        """Get rollups as plain dicts (for snapshots)"""
+        return {
+            "daily_revenue": dict(cls._daily_revenue),
+            "daily_orders": dict(cls._daily_orders),
+            "status_counts": dict(cls._status_counts),
+            "product_units": dict(cls._product_units),
+            "product_revenue": dict(cls._product_revenue),
+            "product_names": dict(cls._product_names)
+        }
+    
+    @classmethod
+    def load_state(cls, state: Dict[str, Dict]) -> None:
+        """Restore rollups from export_state output"""
+        cls._daily_revenue = dict(state.get("daily_revenue", {}))
+        cls._daily_orders = dict(state.get("daily_orders", {}))
+        cls._status_counts = dict(state.get("status_counts", {}))
+        cls._product_units = dict(state.get("product_units", {}))
+        cls._product_revenue = dict(state.get("product_revenue", {}))
+        cls._product_names = dict(state.get("product_names", {}))
+    
+    @classmethod
+    async def get_analytics(
+        cls,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        top_products: int = 10
+    ) -> OrderAnalyticsResponse:
+        """
+        Get sales rollups
+        
+        Args:
+            date_from: Optional first day (YYYY-MM-DD) for daily revenue
+            date_to: Optional last day (YYYY-MM-DD) for daily revenue
+            top_products: Number of products to return, ranked by revenue
+            
+        Returns:
+            OrderAnalyticsResponse
+        """
+        daily_revenue = [
+            DailyRevenue(
+                date=day,
+                revenue=round(cls._daily_revenue[day], 2),
+                orders=cls._daily_orders.get(day, 0)
+            )
+            for day in sorted(cls._daily_revenue)
+            if (not date_from or day >= date_from) and (not date_to or day <= date_to)
+        ]
+        
+        top_ids = nlargest(top_products, cls._product_revenue, key=cls._product_revenue.get)
+        products = [
+            ProductSales(
+                product_id=product_id,
+                product_name=cls._product_names.get(product_id, ""),
+                units=cls._product_units.get(product_id, 0),
+                revenue=round(cls._product_revenue[product_id], 2)
+            )
+            for product_id in top_ids
+            if cls._product_units.get(product_id, 0) > 0
+        ]
+        
+        return OrderAnalyticsResponse(
+            success=True,
+            total_revenue=round(sum(entry.revenue for entry in daily_revenue), 2),
+            total_orders=sum(entry.orders for entry in daily_revenue),
+            status_counts={status_value: count for status_value, count in cls._status_counts.items() if count},
+            daily_revenue=daily_revenue,
+            top_products=products
+        )
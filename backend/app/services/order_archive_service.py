@@ -0,0 +1,328 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+import sqlite3
+import zlib
+
+from app.models.order import OrderDetails, OrderFilters, OrderStatusEnum
+
+
+class OrderArchiveService:
+    """
+    Cold storage tier for orders in terminal states
+    
+    Archived orders are stored as zlib-compressed JSON in a local SQLite
+    database, next to a few plain columns (owner, number, status, date,
+    amount, search text) so lookups and list filters can be evaluated without
+    decompressing. Full orders are only decoded when requested, through a
+    small LRU cache.
+    
+    Archived orders are not kept in OrderService's in-memory indexes: number,
+    owner, status and date lookups are answered by SQLite indexes, so
+    resident memory does not grow with order history. Text search over the
+    archive scans the search_text column on disk.
+    """
+    
+    TERMINAL_STATUSES = {OrderStatusEnum.DELIVERED, OrderStatusEnum.CANCELLED}
+    CACHE_SIZE = 256
+    QUERY_CHUNK_SIZE = 500  # ids per IN (...) query
+    
+    _db_path: Optional[Path] = None
+    _conn: Optional[sqlite3.Connection] = None
+    _cache: "OrderedDict[str, OrderDetails]" = OrderedDict()
+    
+    @classmethod
+    def initialize(cls, db_path: Path) -> None:
+        """Open (creating if needed) the archive database"""
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS archived_orders ("
+            "id TEXT PRIMARY KEY, "
+            "user_id TEXT NOT NULL, "
+            "order_number TEXT NOT NULL, "
+            "status TEXT NOT NULL, "
+            "order_date TEXT NOT NULL, "
+            "total_amount REAL NOT NULL, "
+            "search_text TEXT NOT NULL, "
+            "archived_at TEXT NOT NULL, "
+            "payload BLOB NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS archived_orders_number ON archived_orders (order_number)")
+        conn.execute("CREATE INDEX IF NOT EXISTS archived_orders_user ON archived_orders (user_id, order_date)")
+        conn.execute("CREATE INDEX IF NOT EXISTS archived_orders_date ON archived_orders (order_date)")
+        conn.execute("CREATE INDEX IF NOT EXISTS archived_orders_status ON archived_orders (status, order_date)")
+        conn.commit()
+        cls._db_path = db_path
+        cls._conn = conn
+        cls._cache = OrderedDict()
+    
+    @classmethod
+    def close(cls) -> None:
+        """Close the archive database"""
+        if cls._conn is not None:
+            cls._conn.close()
+            cls._conn = None
+        cls._cache = OrderedDict()
+    
+    @classmethod
+    def enabled(cls) -> bool:
+        return cls._conn is not None
+    
+    @classmethod
+    def _search_text(cls, order: OrderDetails) -> str:
+        """Lowercased searchable fields, one per line"""
+        address = order.shipping_address
+        return "\n".join((
+            order.order_number,
+            address.email,
+            f"{address.first_name} {address.last_name}"
+        )).lower()
+    
+    @classmethod
+    def _decode(cls, payload: bytes) -> OrderDetails:
+        return OrderDetails.model_validate_json(zlib.decompress(payload))
+    
+    @classmethod
+    def _remember(cls, order: OrderDetails) -> None:
+        cls._cache[order.id] = order
+        cls._cache.move_to_end(order.id)
+        while len(cls._cache) > cls.CACHE_SIZE:
+            cls._cache.popitem(last=False)
+    
+    @classmethod
+    def archive_orders(cls, records: List[Tuple[str, OrderDetails]]) -> None:
+        """
+        Write (user_id, order) records to the archive in one transaction
+        
+        Existing rows for the same order id are replaced.
+        """
+        now = datetime.utcnow().isoformat()
+        rows = [
+            (
+                order.id,
+                user_id,
+                order.order_number,
+                OrderStatusEnum(order.status).value,
+                order.order_date.isoformat(),
+                order.total_amount,
+                cls._search_text(order),
+                now,
+                zlib.compress(order.model_dump_json().encode("utf-8"), 6)
+            )
+            for user_id, order in records
+        ]
+        with cls._conn:
+            cls._conn.executemany(
+                "INSERT OR REPLACE INTO archived_orders "
+                "(id, user_id, order_number, status, order_date, total_amount, search_text, archived_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+    
+    @classmethod
+    def get_order(cls, order_id: str) -> Optional[OrderDetails]:
+        """Load a single archived order"""
+        if cls._conn is None:
+            return None
+        if order_id in cls._cache:
+            cls._cache.move_to_end(order_id)
+            return cls._cache[order_id]
+        
+        row = cls._conn.execute(
+            "SELECT payload FROM archived_orders WHERE id = ?", (order_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        order = cls._decode(row[0])
+        cls._remember(order)
+        return order
+    
+    @classmethod
+    def get_orders(cls, order_ids: List[str]) -> Dict[str, OrderDetails]:
+        """Load several archived orders in batched queries"""
+        result: Dict[str, OrderDetails] = {}
+        if cls._conn is None:
+            return result
+        
+        missing = []
+        for order_id in order_ids:
+            if order_id in cls._cache:
+                result[order_id] = cls._cache[order_id]
+            else:
+                missing.append(order_id)
+        
+        for start in range(0, len(missing), cls.QUERY_CHUNK_SIZE):
+            chunk = missing[start:start + cls.QUERY_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            for order_id, payload in cls._conn.execute(
+                f"SELECT id, payload FROM archived_orders WHERE id IN ({placeholders})", chunk
+            ):
+                order = cls._decode(payload)
+                cls._remember(order)
+                result[order_id] = order
+        return result
+    
+    @classmethod
+    def get_user_id(cls, order_id: str) -> Optional[str]:
+        """Get the owner of an archived order"""
+        if cls._conn is None:
+            return None
+        row = cls._conn.execute(
+            "SELECT user_id FROM archived_orders WHERE id = ?", (order_id,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    @classmethod
+    def get_order_id_by_number(cls, order_number: str) -> Optional[str]:
+        """Get the id of an archived order by its order number"""
+        if cls._conn is None:
+            return None
+        row = cls._conn.execute(
+            "SELECT id FROM archived_orders WHERE order_number = ?", (order_number,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    @classmethod
+    def get_highest_order_number(cls, prefix: str) -> Optional[str]:
+        """Get the highest archived order number starting with prefix"""
+        if cls._conn is None:
+            return None
+        row = cls._conn.execute(
+            "SELECT order_number FROM archived_orders WHERE substr(order_number, 1, ?) = ? "
+            "ORDER BY length(order_number) DESC, order_number DESC LIMIT 1",
+            (len(prefix), prefix)
+        ).fetchone()
+        return row[0] if row else None
+    
+    @classmethod
+    def delete_order(cls, order_id: str) -> None:
+        """Remove an order from the archive"""
+        cls.delete_orders([order_id])
+    
+    @classmethod
+    def delete_orders(cls, order_ids: List[str]) -> None:
+        """Remove orders from the archive (ids not archived are ignored)"""
+        if cls._conn is None:
+            return
+        with cls._conn:
+            for start in range(0, len(order_ids), cls.QUERY_CHUNK_SIZE):
+                chunk = order_ids[start:start + cls.QUERY_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                cls._conn.execute(f"DELETE FROM archived_orders WHERE id IN ({placeholders})", chunk)
+        for order_id in order_ids:
+            cls._cache.pop(order_id, None)
+    
+    @classmethod
+    def _filter_conditions(
+        cls,
+        filters: OrderFilters,
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+        user_id: Optional[str]
+    ) -> Tuple[str, List]:
+        """SQL WHERE clause and parameters for the list filters"""
+        conditions = []
+        params: List = []
+        if user_id is not None:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+        if filters.status:
+            conditions.append("status = ?")
+            params.append(OrderStatusEnum(filters.status).value)
+        if date_from:
+            conditions.append("order_date >= ?")
+            params.append(date_from.isoformat())
+        if date_to:
+            conditions.append("order_date <= ?")
+            params.append(date_to.isoformat())
+        if filters.min_amount is not None:
+            conditions.append("total_amount >= ?")
+            params.append(filters.min_amount)
+        if filters.max_amount is not None:
+            conditions.append("total_amount <= ?")
+            params.append(filters.max_amount)
+        if filters.search:
+            conditions.append("instr(search_text, ?) > 0")
+            params.append(filters.search.lower())
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return where, params
+    
+    @classmethod
+    def query_order_dates(
+        cls,
+        filters: OrderFilters,
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+        user_id: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[int, List[Tuple[datetime, str]]]:
+        """
+        Apply list filters to archived orders without decompressing them
+        
+        Args:
+            filters: List filters (page and limit are ignored)
+            date_from: Optional lower bound on order date
+            date_to: Optional upper bound on order date
+            user_id: Only orders of this user, if given
+            limit: Return at most this many matches (all if None)
+        
+        Returns:
+            Tuple of (number of matching orders, (order date, order id) of the
+            first `limit` matches, newest first)
+        """
+        if cls._conn is None:
+            return 0, []
+        where, params = cls._filter_conditions(filters, date_from, date_to, user_id)
+        total = cls._conn.execute(f"SELECT count(*) FROM archived_orders{where}", params).fetchone()[0]
+        if not total or limit == 0:
+            return total, []
+        rows = cls._conn.execute(
+            f"SELECT order_date, id FROM archived_orders{where} ORDER BY order_date DESC, id DESC LIMIT ?",
+            params + [-1 if limit is None else limit]
+        )
+        return total, [(datetime.fromisoformat(order_date), order_id) for order_date, order_id in rows]
+    
+    @classmethod
+    def get_order_dates_after(
+        cls,
+        after: Optional[Tuple[datetime, str]],
+        date_to: Optional[datetime],
+        order_status: Optional[OrderStatusEnum],
+        limit: int
+    ) -> List[Tuple[datetime, str]]:
+        """
+        Page through archived orders in (order date, id) order
+        
+        Args:
+            after: Keyset cursor; only orders sorting after it are returned
+            date_to: Optional upper bound on order date
+            order_status: Optional status filter
+            limit: Maximum rows to return
+        
+        Returns:
+            (order date, order id) pairs, oldest first
+        """
+        if cls._conn is None:
+            return []
+        conditions = []
+        params: List = []
+        if after is not None:
+            conditions.append("(order_date > ? OR (order_date = ? AND id > ?))")
+            params.extend((after[0].isoformat(), after[0].isoformat(), after[1]))
+        if date_to:
+            conditions.append("order_date <= ?")
+            params.append(date_to.isoformat())
+        if order_status:
+            conditions.append("status = ?")
+            params.append(OrderStatusEnum(order_status).value)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return [
+            (datetime.fromisoformat(order_date), order_id)
+            for order_date, order_id in cls._conn.execute(
+                f"SELECT order_date, id FROM archived_orders{where} ORDER BY order_date, id LIMIT ?",
+                params + [limit]
+            )
+        ]
@@ -0,0 +1,215 @@
+from typing import Any, AsyncIterator, Dict, List, Optional
+from fastapi import HTTPException, status
+import asyncio
+import csv
+import io
+import json
+
+from app.models.order import OrderDetails, OrderStatusEnum
+from app.services.order_service import OrderService
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands back whatever was written since the last drain"""
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class OrderExportService:
+    """Service layer for streaming order exports (finance reconciliation)"""
+    
+    CHUNK_SIZE = 500  # orders per chunk (and per Parquet row group)
+    
+    # One row per OrderItem
+    COLUMNS = [
+        "order_id", "order_number", "order_date", "status",
+        "customer_name", "email", "currency",
+        "subtotal", "shipping", "tax", "discount", "total",
+        "item_id", "product_id", "product_name", "quantity", "unit_price", "item_total"
+    ]
+    
+    MEDIA_TYPES = {
+        "csv": "text/csv",
+        "ndjson": "application/x-ndjson",
+        "parquet": "application/vnd.apache.parquet"
+    }
+    
+    @classmethod
+    def _item_rows(cls, order: OrderDetails) -> List[Dict[str, Any]]:
+        """Flatten an order into one row per item"""
+        address = order.shipping_address
+        base = {
+            "order_id": order.id,
+            "order_number": order.order_number,
+            "order_date": order.order_date.isoformat(),
+            "status": OrderStatusEnum(order.status).value,
+            "customer_name": f"{address.first_name} {address.last_name}",
+            "email": address.email,
+            "currency": order.currency,
+            "subtotal": order.pricing.subtotal,
+            "shipping": order.pricing.shipping,
+            "tax": order.pricing.tax,
+            "discount": order.pricing.discount,
+            "total": order.pricing.total
+        }
+        return [
+            {
+                **base,
+                "item_id": item.id,
+                "product_id": item.product_id,
+                "product_name": item.product_name,
+                "quantity": item.quantity,
+                "unit_price": item.unit_price,
+                "item_total": item.total_price
+            }
+            for item in order.items
+        ]
+    
+    @classmethod
+    async def _iter_chunks(
+        cls,
+        date_from: Optional[str],
+        date_to: Optional[str],
+        order_status: Optional[OrderStatusEnum]
+    ) -> AsyncIterator[List[OrderDetails]]:
+        async for orders in OrderService.iter_orders(date_from, date_to, order_status, cls.CHUNK_SIZE):
+            yield orders
+            # Let other requests run between chunks
+            await asyncio.sleep(0)
+    
+    @classmethod
+    async def stream_csv(
+        cls,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        order_status: Optional[OrderStatusEnum] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream flattened CSV, one row per order item"""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=cls.COLUMNS)
+        writer.writeheader()
+        
+        async for orders in cls._iter_chunks(date_from, date_to, order_status):
+            for order in orders:
+                writer.writerows(cls._item_rows(order))
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+    
+    @classmethod
+    async def stream_ndjson(
+        cls,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        order_status: Optional[OrderStatusEnum] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream complete orders as newline-delimited JSON"""
+        async for orders in cls._iter_chunks(date_from, date_to, order_status):
+            yield "".join(
+                json.dumps(order.model_dump(mode="json", by_alias=True)) + "\n"
+                for order in orders
+            ).encode("utf-8")
+    
+    @classmethod
+    def _parquet_modules(cls):
+        """Import pyarrow lazily (optional dependency)"""
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail="Parquet export requires the 'pyarrow' package"
+            )
+        return pyarrow, pyarrow.parquet
+    
+    @classmethod
+    async def stream_parquet(
+        cls,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        order_status: Optional[OrderStatusEnum] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream flattened rows as Parquet, one row group per chunk"""
+        pa, pq = cls._parquet_modules()
+        schema = pa.schema([
+            ("order_id", pa.string()),
+            ("order_number", pa.string()),
+            ("order_date", pa.string()),
+            ("status", pa.string()),
+            ("customer_name", pa.string()),
+            ("email", pa.string()),
+            ("currency", pa.string()),
+            ("subtotal", pa.float64()),
+            ("shipping", pa.float64()),
+            ("tax", pa.float64()),
+            ("discount", pa.float64()),
+            ("total", pa.float64()),
+            ("item_id", pa.string()),
+            ("product_id", pa.string()),
+            ("product_name", pa.string()),
+            ("quantity", pa.int64()),
+            ("unit_price", pa.float64()),
+            ("item_total", pa.float64())
+        ])
+        
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema)
+        try:
+            async for orders in cls._iter_chunks(date_from, date_to, order_status):
+                rows = [row for order in orders for row in cls._item_rows(order)]
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                data = sink.drain()
+                if data:
+                    yield data
+        finally:
+            writer.close()
+        yield sink.drain()
+    
+    @classmethod
+    def get_stream(
+        cls,
+        export_format: str,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        order_status: Optional[OrderStatusEnum] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Get the byte stream for an export format
+        
+        Raises:
+            HTTPException: 400 for unknown formats, 501 if Parquet is unavailable
+        """
+        if export_format == "csv":
+            return cls.stream_csv(date_from, date_to, order_status)
+        if export_format == "ndjson":
+            return cls.stream_ndjson(date_from, date_to, order_status)
+        if export_format == "parquet":
+            cls._parquet_modules()
+            return cls.stream_parquet(date_from, date_to, order_status)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format '{export_format}'"
+        )
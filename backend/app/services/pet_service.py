@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
 from fastapi import HTTPException, status
 import uuid
@@ -160,6 +160,11 @@ class PetService:
         """Get pet by ID"""
         return cls._pets.get(pet_id)
     
+    @classmethod
+    async def get_pets_by_ids(cls, pet_ids: Iterable[str]) -> Dict[str, Pet]:
+        """Get several pets in one lookup (unknown ids are skipped)"""
+        return {pet_id: cls._pets[pet_id] for pet_id in pet_ids if pet_id in cls._pets}
+    
     @classmethod
     async def get_pet_by_id_or_404(cls, pet_id: str, user_id: str) -> Pet:
         """Get pet by ID or raise 404"""
@@ -200,6 +205,10 @@ class PetService:
         pet.medical_notes = pet_input.medical_notes
         pet.updated_at = datetime.utcnow()
         
+        # Imported here: the appointment service depends on this module
+        from app.services.appointment_service import AppointmentService
+        AppointmentService.reindex_pet(pet)
+        
         return pet
     
     @classmethod
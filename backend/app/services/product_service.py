@@ -1,4 +1,4 @@
-from typing import Optional, List, Dict
+from typing import Iterable, Optional, List, Dict
 from datetime import datetime
 from fastapi import HTTPException, status
 from uuid import uuid4
@@ -31,6 +31,10 @@ class ProductService:
     _products: Dict[str, ProductDetail] = {}
     _categories: Dict[str, Category] = {}
     
+    # Per-product version, bumped whenever that product's price or stock may
+    # have changed (kept after deletion, so the deletion is seen as a change)
+    _product_versions: Dict[str, int] = {}
+    
     @classmethod
     def initialize_mock_data(cls):
         """Initialize with mock data - call this on startup"""
@@ -699,6 +703,7 @@ class ProductService:
         
         # Store in database
         cls._products[product_id] = updated_product
+        cls._bump_version(product_id)
         
         return ProductUpdatedResponse(
             message="Product updated successfully",
@@ -728,6 +733,7 @@ class ProductService:
         
         # Delete from database
         del cls._products[product_id]
+        cls._bump_version(product_id)
         
         return ProductDeletedResponse(
             message="Product deleted successfully",
@@ -770,3 +776,42 @@ class ProductService:
             if product:
                 products.append(product)
         return products
+    
+    @classmethod
+    async def decrement_stock(cls, product_quantities: Dict[str, int]) -> None:
+        """
+        Deduct sold quantities from stock
+        
+        Stock never goes below zero; a product reaching zero is marked out of
+        stock. Unknown products (e.g. deleted since the sale) are skipped.
+        
+        Args:
+            product_quantities: Dict of {product_id: quantity sold}
+        """
+        now = datetime.utcnow()
+        for product_id, quantity in product_quantities.items():
+            product = cls._products.get(product_id)
+            if not product:
+                continue
+            cls._bump_version(product_id)
+            stock_count = max(0, product.stock_count - quantity)
+            cls._products[product_id] = product.model_copy(update={
+                "stock_count": stock_count,
+                "in_stock": product.in_stock and stock_count > 0,
+                "updated_at": now
+            })
+    
+    @classmethod
+    def _bump_version(cls, product_id: str) -> None:
+        cls._product_versions[product_id] = cls._product_versions.get(product_id, 0) + 1
+    
+    @classmethod
+    def get_product_versions(cls, product_ids: Iterable[str]) -> Dict[str, int]:
+        """
+        Current versions of some products (0 if never changed)
+        
+        A product's version changes whenever its price or stock may have
+        changed, so callers can tell whether data they derived from those
+        products is still current without being invalidated by other products.
+        """
+        return {product_id: cls._product_versions.get(product_id, 0) for product_id in product_ids}
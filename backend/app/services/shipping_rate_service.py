@@ -0,0 +1,154 @@
+from typing import List, NamedTuple, Optional, Tuple
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+from app.models.order import ShippingMethod
+
+
+class ShippingRate(NamedTuple):
+    """A priced shipping option"""
+    method_id: str
+    name: str
+    carrier: str
+    cost: float
+    days: int
+
+
+class ShippingRateService:
+    """
+    Shipping rate engine shared by checkout quotes and order creation
+    
+    Rates come from per-method tables indexed by [zone][weight bracket]:
+    - zone: distance band of the destination, from the first ZIP digit
+    - weight bracket: estimated parcel weight, from the item count
+    Standard shipping is free once the subtotal reaches FREE_SHIPPING_THRESHOLD.
+    Before an address is known (the cart page), shipping is estimated at the
+    nearest zone's rate.
+    
+    Quotes are cached by (zone, weight bracket, subtotal tier), which is
+    everything a quote depends on, so repeat quotes are a dict lookup.
+    """
+    
+    METHODS = {
+        "standard": {"name": "Standard Shipping", "carrier": "USPS", "days": 5},
+        "express": {"name": "Express Shipping", "carrier": "FedEx", "days": 2},
+        "overnight": {"name": "Overnight Shipping", "carrier": "FedEx", "days": 1}
+    }
+    DEFAULT_METHOD = "standard"
+    FREE_SHIPPING_METHODS = {"standard"}
+    
+    # Products carry no weight yet, so parcels are estimated per unit
+    DEFAULT_UNIT_WEIGHT_LB = 1.0
+    
+    # Upper bounds (inclusive, lb) of each weight bracket; heavier parcels use the last column
+    WEIGHT_BRACKETS_LB = (1.0, 3.0, 5.0, 10.0, 20.0)
+    
+    # Zone per first ZIP digit (distance band from the warehouse); unknown ZIPs use the last zone
+    ZONE_BY_ZIP_DIGIT = (3, 3, 2, 1, 1, 0, 0, 1, 2, 3)
+    ZONE_COUNT = 4
+    ESTIMATE_ZONE = 0  # used for cart estimates, before the destination is known
+    
+    # Rate per [zone][weight bracket]
+    RATE_TABLES = {
+        "standard": (
+            (5.99, 7.49, 8.99, 11.99, 16.99, 24.99),
+            (6.99, 8.49, 9.99, 12.99, 18.99, 27.99),
+            (7.99, 9.49, 11.49, 14.99, 21.99, 31.99),
+            (8.99, 10.99, 12.99, 16.99, 24.99, 35.99)
+        ),
+        "express": (
+            (15.99, 18.99, 22.99, 28.99, 39.99, 59.99),
+            (17.99, 21.49, 25.99, 32.99, 44.99, 66.99),
+            (19.99, 23.99, 28.99, 36.99, 49.99, 74.99),
+            (22.99, 27.49, 32.99, 41.99, 56.99, 84.99)
+        ),
+        "overnight": (
+            (29.99, 34.99, 41.99, 52.99, 72.99, 109.99),
+            (33.99, 39.49, 46.99, 59.99, 81.99, 122.99),
+            (37.99, 44.49, 52.99, 67.99, 91.99, 137.99),
+            (42.99, 49.99, 59.99, 76.99, 103.99, 154.99)
+        )
+    }
+    
+    FREE_SHIPPING_THRESHOLD = 50.0  # Free standard shipping from $50
+    
+    # Subtotal tiers (lower bounds); tier >= 1 qualifies for free standard shipping
+    SUBTOTAL_TIERS = (FREE_SHIPPING_THRESHOLD,)
+    
+    @classmethod
+    def _zone(cls, zip_code: str) -> int:
+        """Distance band of a US ZIP code; ZIPs without a 3-digit prefix use the farthest zone"""
+        prefix = zip_code.strip()[:3]
+        if len(prefix) == 3 and prefix.isdigit():
+            return cls.ZONE_BY_ZIP_DIGIT[int(prefix[0])]
+        return cls.ZONE_COUNT - 1
+    
+    @classmethod
+    def _weight_bracket(cls, item_count: int) -> int:
+        weight = max(item_count, 1) * cls.DEFAULT_UNIT_WEIGHT_LB
+        return bisect_left(cls.WEIGHT_BRACKETS_LB, weight)
+    
+    @classmethod
+    def _subtotal_tier(cls, subtotal: float) -> int:
+        return bisect_right(cls.SUBTOTAL_TIERS, subtotal)
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _quote(zone: int, weight_bracket: int, subtotal_tier: int) -> Tuple[ShippingRate, ...]:
+        """Price every method for one cache key"""
+        cls = ShippingRateService
+        rates = []
+        for method_id, method in cls.METHODS.items():
+            cost = cls.RATE_TABLES[method_id][zone][weight_bracket]
+            if subtotal_tier >= 1 and method_id in cls.FREE_SHIPPING_METHODS:
+                cost = 0.0
+            rates.append(ShippingRate(method_id, method["name"], method["carrier"], cost, method["days"]))
+        return tuple(rates)
+    
+    @classmethod
+    def get_rates(cls, zip_code: str, item_count: int, subtotal: float) -> Tuple[ShippingRate, ...]:
+        """
+        Price every shipping method for a destination and cart
+        
+        Args:
+            zip_code: Destination ZIP code
+            item_count: Number of units in the cart
+            subtotal: Cart subtotal
+        
+        Returns:
+            One ShippingRate per method, default method first
+        """
+        return cls._quote(cls._zone(zip_code), cls._weight_bracket(item_count), cls._subtotal_tier(subtotal))
+    
+    @classmethod
+    def estimate_rate(cls, item_count: int, subtotal: float) -> ShippingRate:
+        """
+        Default-method rate for a cart whose destination is not known yet
+        
+        Priced at the nearest zone, so the checkout quote for the real
+        address is never lower than the estimate.
+        """
+        rates = cls._quote(cls.ESTIMATE_ZONE, cls._weight_bracket(item_count), cls._subtotal_tier(subtotal))
+        return next(rate for rate in rates if rate.method_id == cls.DEFAULT_METHOD)
+    
+    @classmethod
+    def get_rate(
+        cls,
+        zip_code: str,
+        item_count: int,
+        subtotal: float,
+        method_id: Optional[str] = None
+    ) -> ShippingRate:
+        """Price a single method, falling back to the default method if unknown"""
+        method_id = method_id if method_id in cls.METHODS else cls.DEFAULT_METHOD
+        for rate in cls.get_rates(zip_code, item_count, subtotal):
+            if rate.method_id == method_id:
+                return rate
+    
+    @classmethod
+    def get_shipping_methods(cls, zip_code: str, item_count: int, subtotal: float) -> List[ShippingMethod]:
+        """Quote every method as ShippingMethod models"""
+        return [
+            ShippingMethod(id=rate.method_id, name=rate.name, cost=rate.cost, estimated_days=rate.days)
+            for rate in cls.get_rates(zip_code, item_count, subtotal)
+        ]
@@ -0,0 +1,191 @@
+"""
+Benchmark order construction: validated models vs the trusted fast path
+
+Builds the same 50-item order three ways and reports per-order CPU time:
+- validated: the original path (model __init__ plus one uuid4 per item)
+- model_construct: pydantic's own unvalidated constructor, for reference
+- trusted: OrderService._build_order (trusted_construct, batched item ids)
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_order_construction [--items 50] [--rounds 2000]
+"""
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from app.models.cart import Cart, CartItem
+from app.models.order import (
+    CheckoutRequest,
+    OrderDetails,
+    OrderItem,
+    OrderPricing,
+    OrderStatus,
+    OrderStatusEnum,
+    ShippingInfo
+)
+from app.services.order_service import OrderService
+from app.services.product_service import ProductService
+from app.services.shipping_rate_service import ShippingRate, ShippingRateService
+
+
+def make_cart(item_count: int) -> Cart:
+    ProductService.initialize_mock_data()
+    products = list(ProductService._products.values())
+    items = [
+        CartItem(id=f"ci_{i}", product=products[i % len(products)], quantity=1 + i % 3)
+        for i in range(item_count)
+    ]
+    subtotal = round(sum(item.product.price * item.quantity for item in items), 2)
+    return Cart(
+        id="cart_bench",
+        items=items,
+        total_items=sum(item.quantity for item in items),
+        subtotal=subtotal,
+        tax=round(subtotal * 0.08, 2)
+    )
+
+
+def make_checkout_request() -> CheckoutRequest:
+    return CheckoutRequest.model_validate({
+        "shippingAddress": {
+            "firstName": "John", "lastName": "Doe", "email": "john@example.com",
+            "phone": "1234567890", "address": "1 Main St", "city": "New York",
+            "state": "NY", "zipCode": "10001", "country": "USA"
+        },
+        "billingAddress": {
+            "firstName": "John", "lastName": "Doe", "address": "1 Main St",
+            "city": "New York", "state": "NY", "zipCode": "10001", "country": "USA"
+        },
+        "paymentMethod": {"type": "card"}
+    })
+
+
+def validated(model_cls, **values):
+    return model_cls(**values)
+
+
+def constructed(model_cls, **values):
+    return model_cls.model_construct(**values)
+
+
+def build_original(build, cart: Cart, checkout_request: CheckoutRequest, shipping_rate: ShippingRate) -> OrderDetails:
+    """The construction path create_order_from_cart used before the fast path"""
+    now = datetime.utcnow()
+    order_items = [
+        build(
+            OrderItem,
+            id=f"oi_{uuid.uuid4().hex[:8]}",
+            product_id=cart_item.product.id,
+            product_name=cart_item.product.name,
+            product_image=cart_item.product.images[0] if cart_item.product.images else "",
+            quantity=cart_item.quantity,
+            unit_price=cart_item.product.price,
+            total_price=cart_item.product.price * cart_item.quantity
+        )
+        for cart_item in cart.items
+    ]
+    pricing = build(
+        OrderPricing,
+        subtotal=cart.subtotal,
+        shipping=shipping_rate.cost,
+        tax=cart.tax,
+        discount=0.0,
+        total=cart.subtotal + shipping_rate.cost + cart.tax
+    )
+    tracking_number = "TRK123456789"
+    shipping_info = build(
+        ShippingInfo,
+        method=shipping_rate.name,
+        carrier=shipping_rate.carrier,
+        tracking_number=tracking_number,
+        tracking_url=f"https://tracking.{shipping_rate.carrier.lower()}.com/{tracking_number}",
+        estimated_delivery=(now + timedelta(days=shipping_rate.days)).strftime("%Y-%m-%d")
+    )
+    status_history = [
+        build(OrderStatus, status=OrderStatusEnum.PENDING, timestamp=now, note="Order placed successfully", location=None)
+    ]
+    return build(
+        OrderDetails,
+        id="order_bench",
+        order_number="ORD-2024-000001",
+        status=OrderStatusEnum.PENDING,
+        status_history=status_history,
+        total_amount=pricing.total,
+        currency="USD",
+        items=order_items,
+        shipping_address=checkout_request.shipping_address,
+        billing_address=checkout_request.billing_address,
+        payment_method=checkout_request.payment_method,
+        pricing=pricing,
+        shipping=shipping_info,
+        order_date=now,
+        updated_at=now
+    )
+
+
+def build_validated(cart: Cart, checkout_request: CheckoutRequest, shipping_rate: ShippingRate) -> OrderDetails:
+    return build_original(validated, cart, checkout_request, shipping_rate)
+
+
+def build_model_construct(cart: Cart, checkout_request: CheckoutRequest, shipping_rate: ShippingRate) -> OrderDetails:
+    return build_original(constructed, cart, checkout_request, shipping_rate)
+
+
+def build_trusted(cart: Cart, checkout_request: CheckoutRequest, shipping_rate: ShippingRate) -> OrderDetails:
+    return OrderService._build_order(
+        order_id="order_bench",
+        order_number="ORD-2024-000001",
+        cart=cart,
+        checkout_request=checkout_request,
+        shipping_rate=shipping_rate,
+        tracking_number="TRK123456789",
+        now=datetime.utcnow()
+    )
+
+
+def measure(build, rounds: int, *args) -> float:
+    """Best-of-5 per-order CPU time in microseconds"""
+    best = float("inf")
+    for _ in range(5):
+        start = time.process_time()
+        for _ in range(rounds):
+            build(*args)
+        best = min(best, time.process_time() - start)
+    return best / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+    
+    cart = make_cart(args.items)
+    checkout_request = make_checkout_request()
+    shipping_rate = ShippingRateService.get_rate("10001", cart.total_items, cart.subtotal)
+    
+    # The fast path must serialize exactly like the validated one (ids aside)
+    def comparable(order: OrderDetails) -> dict:
+        data = order.model_dump(mode="json", exclude={"order_date", "updated_at", "status_history"})
+        for item in data["items"]:
+            item.pop("id")
+        return data
+    
+    assert comparable(build_trusted(cart, checkout_request, shipping_rate)) == \
+        comparable(build_validated(cart, checkout_request, shipping_rate)), \
+        "fast path output differs from validated output"
+    
+    validated_us = measure(build_validated, args.rounds, cart, checkout_request, shipping_rate)
+    construct_us = measure(build_model_construct, args.rounds, cart, checkout_request, shipping_rate)
+    trusted_us = measure(build_trusted, args.rounds, cart, checkout_request, shipping_rate)
+    
+    print(f"{args.items}-item order, best of 5 x {args.rounds} rounds")
+    print(f"  validated models:  {validated_us:8.1f} us/order")
+    print(f"  model_construct:   {construct_us:8.1f} us/order")
+    print(f"  trusted fast path: {trusted_us:8.1f} us/order")
+    print(f"  saved:             {validated_us - trusted_us:8.1f} us/order ({validated_us / trusted_us:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
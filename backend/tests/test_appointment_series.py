@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.interval_index import SpanIndex
+from app.core.search_index import NgramIndex
+from app.models.appointment import BookAppointmentInput, BookAppointmentSeriesInput
+from app.services.appointment_service import AppointmentService
+from app.services.clinic_resource_service import ClinicResourceService
+from app.services.pet_service import PetService
+
+
+OWNER_ID = "owner_123"
+PET_ID = "pet_001"
+UTC_OPEN_END = datetime.max.replace(tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def appointments(monkeypatch):
+    """A fresh, empty AppointmentService with the mock pets and clinic resources"""
+    PetService.initialize_mock_data()
+    ClinicResourceService.initialize_mock_data()
+    state = {
+        "_appointments": {},
+        "_appointments_by_day": {},
+        "_appointment_days": [],
+        "_appointments_by_owner": {},
+        "_appointments_by_pet": {},
+        "_resource_indexes": {},
+        "_resource_load": {},
+        "_indexed_resources": {},
+        "_series": {},
+        "_series_spans": SpanIndex(UTC_OPEN_END),
+        "_series_by_resource": {},
+        "_series_by_owner": {},
+        "_series_by_pet": {},
+        "_search_index": NgramIndex(),
+        "_last_modified": None,
+        "_last_modified_by_owner": {}
+    }
+    for name, value in state.items():
+        monkeypatch.setattr(AppointmentService, name, value)
+    return AppointmentService
+
+
+def book_series(start: datetime, count: int) -> None:
+    series_input = BookAppointmentSeriesInput(
+        pet_id=PET_ID,
+        appointment_date_time=start.isoformat(),
+        duration=30,
+        appointment_type="checkup",
+        reason="Weekly physiotherapy",
+        vet_id="vet_001",
+        room_id="room_001",
+        recurrence={"frequency": "weekly", "count": count}
+    )
+    asyncio.run(AppointmentService.book_appointment_series(series_input, OWNER_ID))
+
+
+def book_one_off(start: datetime) -> None:
+    appointment_input = BookAppointmentInput(
+        pet_id=PET_ID,
+        appointment_date_time=start.isoformat(),
+        duration=30,
+        appointment_type="checkup",
+        reason="Follow-up",
+        vet_id="vet_001",
+        room_id="room_001"
+    )
+    asyncio.run(AppointmentService.book_appointment(appointment_input, OWNER_ID))
+
+
+def test_expired_series_are_skipped_by_conflict_checks_and_listings(appointments):
+    # 1,000 four-week series on the same vet and room, all finished decades ago
+    history_start = datetime(1940, 1, 1, 9, 0, tzinfo=timezone.utc)
+    for i in range(1000):
+        book_series(history_start + timedelta(weeks=4 * i), count=4)
+
+    upcoming = datetime(2030, 3, 4, 9, 0, tzinfo=timezone.utc)
+    book_series(upcoming, count=4)
+
+    # Only the running series is considered for a window after the history
+    vet_series = appointments._series_by_resource["vet_001"]
+    assert len(vet_series) == 1001
+    window = (upcoming - timedelta(days=1), upcoming + timedelta(days=1))
+    assert len(list(vet_series.overlapping(*window))) == 1
+    assert len(list(appointments._series_spans.overlapping(*window))) == 1
+
+    # Conflict checks still see the running series, and only it
+    with pytest.raises(HTTPException) as conflict:
+        book_one_off(upcoming + timedelta(weeks=1))
+    assert conflict.value.status_code == 409
+    book_one_off(upcoming + timedelta(hours=1))
+
+    # The week view lists the occurrence and the one-off, nothing from the history
+    week = asyncio.run(appointments.get_all_appointments(
+        start_date=upcoming.date().isoformat(),
+        end_date=(upcoming + timedelta(days=6)).date().isoformat()
+    ))
+    assert [a.appointment_date_time for a in week.appointments] == [upcoming, upcoming + timedelta(hours=1)]
+
+    # Expired series still show up for windows that cover them
+    first_week = appointments.get_series_list(history_start.date(), history_start.date())
+    assert len(first_week) == 1
+
+
+def test_span_index_skips_spans_that_ended_before_the_query():
+    index = SpanIndex(UTC_OPEN_END)
+    day = timedelta(days=1)
+    origin = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    index.add("past", origin, origin + day)
+    index.add("running", origin, origin + 10 * day)
+    index.add("open", origin + 2 * day, None)
+    index.add("future", origin + 20 * day, origin + 21 * day)
+
+    assert set(index.overlapping(origin + day, origin + 3 * day)) == {"running", "open"}
+    assert set(index.overlapping(origin + 15 * day, None)) == {"open", "future"}
+    assert set(index.overlapping(None, origin + day)) == {"past", "running"}
+
+    index.remove("running")
+    assert set(index.overlapping(origin + day, origin + 3 * day)) == {"open"}
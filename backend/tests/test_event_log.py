@@ -0,0 +1,51 @@
+import os
+import time
+
+import pytest
+
+from app.core.event_log import EventLog
+
+
+@pytest.fixture
+def fsync_calls(monkeypatch):
+    calls = []
+    real_fsync = os.fsync
+
+    def counting_fsync(fd):
+        calls.append(fd)
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", counting_fsync)
+    return calls
+
+
+def test_pending_events_are_fsynced_when_the_log_goes_idle(tmp_path, fsync_calls):
+    log = EventLog(tmp_path, "orders", fsync_batch_size=100, fsync_interval=0.05)
+    log.load()
+    try:
+        log.append("order_created", {"order_id": "order_1"})  # first append syncs (log was idle)
+        log.append("order_created", {"order_id": "order_2"})  # within the interval: left pending
+        synced = len(fsync_calls)
+
+        deadline = time.monotonic() + 2
+        while len(fsync_calls) == synced and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(fsync_calls) == synced + 1
+        assert log._unsynced == 0
+    finally:
+        log.close()
+
+    reopened = EventLog(tmp_path, "orders")
+    _, events = reopened.load()
+    reopened.close()
+    assert [event["data"]["order_id"] for event in events] == ["order_1", "order_2"]
+
+
+def test_second_process_cannot_open_a_locked_log(tmp_path):
+    log = EventLog(tmp_path, "orders")
+    log.load()
+    try:
+        with pytest.raises(RuntimeError):
+            EventLog(tmp_path, "orders").load()
+    finally:
+        log.close()
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+
+from app.core.job_queue import Job, JobQueue, _JobStore
+
+
+def test_enqueue_leaves_sqlite_to_the_store_thread(tmp_path, monkeypatch):
+    writes = []
+    real_save_many = _JobStore.save_many
+
+    def recording_save_many(store, jobs, failed=False):
+        writes.append((threading.current_thread().name, len(jobs)))
+        real_save_many(store, jobs, failed)
+
+    monkeypatch.setattr(_JobStore, "save_many", recording_save_many)
+    ran = []
+
+    async def scenario():
+        queue = JobQueue(concurrency=2)
+
+        async def handler(payload):
+            ran.append(payload["n"])
+
+        queue.register("test.job", handler)
+        await queue.start(tmp_path / "jobs.db")
+        for n in range(50):
+            queue.enqueue("test.job", {"n": n})
+        while len(ran) < 50:
+            await asyncio.sleep(0.01)
+        await queue.stop()
+
+    asyncio.run(scenario())
+
+    assert sorted(ran) == list(range(50))
+    enqueue_writes = [write for write in writes if write[1]]
+    assert all(name.startswith("job-store") for name, _ in enqueue_writes)
+    assert sum(count for _, count in enqueue_writes) == 50
+    assert len(enqueue_writes) < 50  # buffered jobs are written together
+    store = _JobStore(tmp_path / "jobs.db")
+    assert store.load_pending() == []
+    store.close()
+
+
+def test_jobs_claimed_by_a_crashed_process_run_once_the_lease_lapses(tmp_path):
+    # The dead process held the job under a short lease
+    store = _JobStore(tmp_path / "jobs.db", claim_lease=0.3)
+    store.save(Job(id="job_orphan", name="test.job", payload={}))
+    assert store.claim("job_orphan", "dead-host:1:abcd") == (True, None)
+    store.close()
+    ran = []
+
+    async def scenario():
+        queue = JobQueue(concurrency=1)
+
+        async def handler(payload):
+            ran.append(time.time())
+
+        queue.register("test.job", handler)
+        started = time.time()
+        await queue.start(tmp_path / "jobs.db")
+        while not ran and time.time() - started < 5:
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return started
+
+    started = asyncio.run(scenario())
+    assert len(ran) == 1
+    assert ran[0] - started >= 0.25
@@ -0,0 +1,113 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.search_index import NgramIndex
+from app.models.cart import Cart, CartItem
+from app.models.order import CheckoutRequest, OrderFilters, OrderStatus, OrderStatusEnum
+from app.services.order_archive_service import OrderArchiveService
+from app.services.order_service import OrderService
+from app.services.product_service import ProductService
+from app.services.shipping_rate_service import ShippingRateService
+
+
+@pytest.fixture
+def orders(monkeypatch, tmp_path):
+    """A fresh OrderService with an archive in a temporary directory and no event log"""
+    ProductService.initialize_mock_data()
+    state = {
+        "_orders": {},
+        "_orders_by_number": {},
+        "_orders_by_user": {},
+        "_order_users": {},
+        "_orders_by_status": {},
+        "_orders_by_date": [],
+        "_search_index": NgramIndex(),
+        "_event_log": None,
+        "_inventory_applied": set()
+    }
+    for name, value in state.items():
+        monkeypatch.setattr(OrderService, name, value)
+    OrderArchiveService.initialize(tmp_path / "archive.db")
+    yield OrderService
+    OrderArchiveService.close()
+
+
+def place_order(index: int, user_id: str, order_date: datetime) -> str:
+    product = next(iter(ProductService._products.values()))
+    cart = Cart(
+        id=f"cart_{index}",
+        items=[CartItem(id=f"ci_{index}", product=product, quantity=1)],
+        total_items=1,
+        subtotal=product.price,
+        tax=round(product.price * 0.08, 2)
+    )
+    checkout_request = CheckoutRequest.model_validate({
+        "shippingAddress": {
+            "firstName": "Ada", "lastName": f"Customer{index:03d}", "email": f"ada{index:03d}@example.com",
+            "phone": "1234567890", "address": "1 Main St", "city": "New York",
+            "state": "NY", "zipCode": "10001", "country": "USA"
+        },
+        "billingAddress": {
+            "firstName": "Ada", "lastName": f"Customer{index:03d}", "address": "1 Main St",
+            "city": "New York", "state": "NY", "zipCode": "10001", "country": "USA"
+        },
+        "paymentMethod": {"type": "card"}
+    })
+    order = OrderService._build_order(
+        order_id=f"order_{index:03d}",
+        order_number=f"ORD-2024-{index:06d}",
+        cart=cart,
+        checkout_request=checkout_request,
+        shipping_rate=ShippingRateService.estimate_rate(1, cart.subtotal),
+        tracking_number=f"TRK{index:09d}",
+        now=order_date
+    )
+    OrderService._store_order(order, user_id)
+    return order.id
+
+
+def deliver(order_id: str, when: datetime) -> None:
+    order = OrderService._orders[order_id]
+    OrderService._apply_status_entry(order, OrderStatus(status=OrderStatusEnum.DELIVERED, timestamp=when, note="Delivered"))
+
+
+def test_archived_orders_leave_memory_and_stay_reachable(orders):
+    start = datetime(2024, 1, 1, 12, 0)
+    for index in range(20):
+        place_order(index, f"user_{index % 2}", start + timedelta(days=index))
+    for index in range(15):
+        deliver(f"order_{index:03d}", start + timedelta(days=index + 2))
+
+    assert orders.archive_orders(older_than_days=0) == 15
+
+    # Nothing about archived orders stays resident
+    archived_ids = {f"order_{index:03d}" for index in range(15)}
+    assert set(orders._orders) == {f"order_{index:03d}" for index in range(15, 20)}
+    assert not archived_ids & set(orders._order_users)
+    assert not archived_ids & set(orders._orders_by_number.values())
+    assert not archived_ids & {order_id for _, order_id in orders._orders_by_date}
+    assert not archived_ids & set().union(*orders._orders_by_status.values())
+    assert not archived_ids & set().union(*orders._orders_by_user.values())
+    assert len(orders._search_index) == 5
+
+    # Lookups fall through to the archive
+    assert asyncio.run(orders.get_order_by_number("ORD-2024-000003")).id == "order_003"
+    user_orders = asyncio.run(orders.list_orders(OrderFilters(limit=4, page=2), "user_0"))
+    assert user_orders.pagination.total == 10
+    assert [order.id for order in user_orders.orders] == ["order_010", "order_008", "order_006", "order_004"]
+    found = asyncio.run(orders.list_all_orders(OrderFilters(search="customer007")))
+    assert [order.id for order in found.orders] == ["order_007"]
+    delivered = asyncio.run(orders.list_all_orders(OrderFilters(status=OrderStatusEnum.DELIVERED, limit=50)))
+    assert delivered.pagination.total == 15
+
+    async def export_ids():
+        return [order.id for chunk in [c async for c in orders.iter_orders(chunk_size=4)] for order in chunk]
+    assert asyncio.run(export_ids()) == [f"order_{index:03d}" for index in range(20)]
+
+    # Changing an archived order brings it back into the hot tier and its indexes
+    asyncio.run(orders.update_order_status("order_004", OrderStatusEnum.DELIVERED, "Re-delivered"))
+    assert orders._order_users["order_004"] == "user_0"
+    assert orders._orders_by_user["user_0"] == ["order_004", "order_016", "order_018"]
+    assert OrderArchiveService.get_order("order_004") is None
@@ -0,0 +1,34 @@
+from app.core.sequence_allocator import SequenceAllocator
+
+
+def test_allocators_sharing_a_database_never_overlap(tmp_path):
+    db_path = tmp_path / "sequences.db"
+    first = SequenceAllocator(db_path, block_size=5)
+    second = SequenceAllocator(db_path, block_size=5)
+    try:
+        first_values = []
+        second_values = []
+        for _ in range(23):
+            first_values.append(first.next_value("order-2024"))
+            second_values.append(second.next_value("order-2024"))
+            second_values.append(second.next_value("order-2024"))
+
+        assert len(set(first_values)) == len(first_values)
+        assert len(set(second_values)) == len(second_values)
+        assert not set(first_values) & set(second_values)
+    finally:
+        first.close()
+        second.close()
+
+
+def test_ensure_at_least_applies_to_other_allocators(tmp_path):
+    db_path = tmp_path / "sequences.db"
+    first = SequenceAllocator(db_path, block_size=5)
+    second = SequenceAllocator(db_path, block_size=5)
+    try:
+        first.ensure_at_least("order-2024", 100)
+        assert second.next_value("order-2024") >= 100
+        assert first.next_value("order-2024") >= 100
+    finally:
+        first.close()
+        second.close()
@@ -40,7 +40,7 @@ const fetchOrders = async (
 	params.append("page", (filters.page || 1).toString());
 	params.append("limit", (filters.limit || 10).toString());
 
-	const response = await fetch(`/api/orders?${params.toString()}`);
+	const response = await fetch(`/api/admin/orders?${params.toString()}`);
 
 	if (!response.ok) {
 		throw new Error(`Failed to fetch orders: ${response.statusText}`);